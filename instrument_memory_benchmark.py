@@ -0,0 +1,23 @@
+import time
+import tracemalloc
+from QuantLib import Date, Settings, Period, Months, Option
+from ql_wrapper.instruments import Option as VanillaOption
+
+# Per-instrument memory and construction time for a large book of Option objects.
+if __name__ == "__main__":
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    maturity = today + Period(6, Months)
+    N = 200_000
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    book = [VanillaOption(50.0 + i % 100, maturity, Option.Call) for i in range(N)]
+    elapsed = time.perf_counter() - t0
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{N:,} options  bytes/option={current / N:7.1f}  construct={elapsed / N * 1e6:6.2f}us/option")
+
+    t0 = time.perf_counter()
+    keys = {opt.key for opt in book} if hasattr(VanillaOption, "key") else set()
+    print(f"distinct keys={len(keys):,}  key time={(time.perf_counter() - t0) / N * 1e6:6.2f}us/option")
@@ -10,6 +10,15 @@ def mc_stats_vs_paths(mc_model, option_obj, Ns, bump=0.10):
         prices.append(p); ses.append(se); deltas.append(d)
     return np.array(prices), np.array(ses), np.array(deltas)
 
+def control_variate_efficiency(mc_model, option_obj, Ns, control_variate=True, seed=42):
+    """Variance ratio SE_plain^2 / SE_cv^2 per N: how many times fewer paths the CV estimator needs."""
+    gains = []
+    for N in Ns:
+        _, se_plain = mc_model.price_and_se(option_obj, num_paths=int(N), seed=seed)
+        _, se_cv = mc_model.price_and_se(option_obj, num_paths=int(N), seed=seed, control_variate=control_variate)
+        gains.append((se_plain / se_cv) ** 2 if se_cv > 0 else np.inf)
+    return np.array(gains)
+
 def plot_convergence(mc_model, bs_model, option_obj, Ns, bump=0.10, antithetic=False):
     true_price = bs_model.price(option_obj)
     true_delta = bs_model.greeks(option_obj)['delta']
@@ -66,26 +75,26 @@ def plot_convergence(mc_model, bs_model, option_obj, Ns, bump=0.10, antithetic=F
     
 
 if __name__ == "__main__":
-    from QuantLib import Date, Settings, Period, Months, Option
+    from QuantLib import Date, Settings, Period, Months, Option as QLOption
+    from ql_wrapper.instruments import Option
 
     # Evaluation date
     today = Date.todaysDate()
     Settings.instance().evaluationDate = today
 
-    # Build a simple option object with required attributes
-    class Opt: pass
-    opt = Opt()
-    opt.type = Option.Call
-    opt.strike = 100.0
-    opt.maturity = today + Period(6, Months)
+    opt = Option(strike=100.0, maturity_date=today + Period(6, Months), option_type=QLOption.Call)
 
     # Models
-    bs = BlackScholesModel(spot=100.0, strike_price=opt.strike, risk_free_rate=0.03, volatility=0.20)
+    bs = BlackScholesModel(spot=100.0, risk_free_rate=0.03, volatility=0.20)
     mc = MonteCarloModel(spot=100.0, risk_free_rate=0.03, volatility=0.20, num_paths=10000)
 
     # Path counts to test
     Ns = np.array([500, 1000, 2000, 5000, 10000, 20000, 50000])
 
+    # Control-variate efficiency gain (paths saved at equal accuracy)
+    for N, gain in zip(Ns, control_variate_efficiency(mc, opt, Ns)):
+        print(f"N={N:>6}  control-variate efficiency gain = {gain:.2f}x")
+
     # Run the convergence plots
     plot_convergence(mc, bs, opt, Ns, bump=0.10, antithetic=False)
     plot_convergence(mc, bs, opt, Ns, bump=0.10, antithetic=True)
@@ -0,0 +1,23 @@
+import os
+import time
+from QuantLib import Date, Settings, Period, Months, Option
+from ql_wrapper.models import MonteCarloModel
+from ql_wrapper.instruments import Option as VanillaOption
+
+# Scaling benchmark for MonteCarloModel's process-pool mode.
+if __name__ == "__main__":
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    opt = VanillaOption(100.0, today + Period(6, Months), Option.Call)
+    mc = MonteCarloModel(spot=100.0, risk_free_rate=0.03, volatility=0.20, div_yield=0.01)
+
+    N = 50_000_000
+    counts = sorted({1, 2, 4, 8, os.cpu_count() or 1})
+    base = None
+    for w in counts:
+        t0 = time.perf_counter()
+        price, se = mc.price_and_se(opt, num_paths=N, seed=42, antithetic=True, workers=w)
+        elapsed = time.perf_counter() - t0
+        base = base or elapsed
+        print(f"workers={w:>3}  price={price:.6f}  SE={se:.6f}  time={elapsed:7.3f}s  "
+              f"paths/s={N / elapsed:,.0f}  speedup={base / elapsed:5.2f}x")
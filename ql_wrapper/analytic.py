@@ -0,0 +1,149 @@
+"""Vectorized closed-form Black–Scholes–Merton pricing and greeks over whole arrays of contracts."""
+import numpy as np
+from scipy.special import ndtr
+from QuantLib import Option as QLOption, Actual365Fixed, Date, DateParser, Settings
+
+_SQRT_2PI = np.sqrt(2.0 * np.pi)
+_SIGNS = {"C": 1.0, "CALL": 1.0, "P": -1.0, "PUT": -1.0}
+
+
+def option_sign(option_type):
+    """+1 for calls, -1 for puts; accepts QuantLib Option.Call/Put, 'C'/'P'/'call'/'put', or arrays of them."""
+    types = np.asarray(option_type)
+    if types.dtype.kind in "iuf":
+        return np.where(types == QLOption.Call, 1.0, -1.0)
+    try:
+        return np.vectorize(lambda t: _SIGNS[str(t).strip().upper()], otypes=[float])(types)
+    except KeyError as e:
+        raise ValueError(f"Unsupported option type: {e.args[0]}") from None
+
+
+def year_fractions(expiries, today=None):
+    """Actual/365 year fractions from `today` (default: evaluation date) to each expiry.
+
+    Expiries may be QuantLib Dates, datetime.date objects or ISO date strings."""
+    today = today or Settings.instance().evaluationDate
+    dc = Actual365Fixed()
+
+    def to_date(d):
+        if isinstance(d, Date):
+            return d
+        if hasattr(d, "year"):
+            return Date(d.day, d.month, d.year)
+        return DateParser.parseISO(str(d)[:10])
+
+    return np.array([dc.yearFraction(today, to_date(d)) for d in np.atleast_1d(expiries)])
+
+
+def bs_greeks(spot, strike, T, option_type, r, q, vol):
+    """Price, delta, gamma, vega, theta and rho for arrays of european options (inputs broadcast).
+
+    Units follow QuantLib's AnalyticEuropeanEngine: vega and rho per 1.00 change, theta per
+    year. Expired contracts (T <= 0) return intrinsic value and zero greeks; zero vol gives
+    the discounted-forward intrinsic max(w * (S e^-qT - K e^-rT), 0) and its greeks."""
+    S, K, T, r, q, vol = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (spot, strike, T, r, q, vol)))
+    w = np.broadcast_to(option_sign(option_type), S.shape)
+    live = T > 0
+    flat = live & (vol <= 0)
+    Tl = np.where(live, T, 1.0)
+    sd = np.where(live & ~flat, vol, 1.0) * np.sqrt(Tl)
+    d1 = (np.log(S / K) + (r - q) * Tl) / sd + 0.5 * sd
+    d2 = d1 - sd
+    df_q = np.exp(-q * Tl)
+    df_r = np.exp(-r * Tl)
+    # at zero vol the normal CDFs collapse to the in-the-money-forward indicator
+    itm = (w * (S * df_q - K * df_r) > 0).astype(float)
+    Nd1 = np.where(flat, itm, ndtr(w * d1))
+    Nd2 = np.where(flat, itm, ndtr(w * d2))
+    pdf_d1 = np.where(flat, 0.0, np.exp(-0.5 * d1 * d1) / _SQRT_2PI)
+
+    price = w * (S * df_q * Nd1 - K * df_r * Nd2)
+    delta = w * df_q * Nd1
+    gamma = df_q * pdf_d1 / (S * sd)
+    vega = S * df_q * pdf_d1 * np.sqrt(Tl)
+    theta = -S * df_q * pdf_d1 * sd / (2.0 * Tl) - w * r * K * df_r * Nd2 + w * q * S * df_q * Nd1
+    rho = w * K * Tl * df_r * Nd2
+
+    zero = np.zeros(S.shape)
+    return {
+        "price": np.where(live, price, np.maximum(w * (S - K), 0.0)),
+        "delta": np.where(live, delta, zero),
+        "gamma": np.where(live, gamma, zero),
+        "vega": np.where(live, vega, zero),
+        "theta": np.where(live, theta, zero),
+        "rho": np.where(live, rho, zero),
+    }
+
+
+def bs_price(spot, strike, T, option_type, r, q, vol):
+    """Black–Scholes–Merton prices only (see bs_greeks)."""
+    return bs_greeks(spot, strike, T, option_type, r, q, vol)["price"]
+
+
+def chain_greeks(chain, spot, r, q=0.0, today=None, vol_column="implied_vol"):
+    """bs_greeks for an option-chain DataFrame (expiry, strike, type and an implied-vol column),
+    e.g. from OptionChainReader; returns a copy of the frame with one column per output."""
+    out = chain.copy()
+    T = year_fractions(chain["expiry"].to_numpy(), today)
+    results = bs_greeks(spot, chain["strike"].to_numpy(), T, chain["type"].to_numpy(), r, q,
+                        chain[vol_column].to_numpy())
+    for name, values in results.items():
+        out[name] = values
+    return out
+
+
+def implied_vol(price, spot, strike, T, option_type, r, q=0.0, tol=1e-10, max_iter=50):
+    """Black–Scholes–Merton implied vols for arrays of option prices (inputs broadcast).
+
+    Each quote is converted by put-call parity to its out-of-the-money side, seeded with
+    the Corrado–Miller closed-form guess and refined by Halley steps that fall back to
+    bisection whenever a step leaves the current bracket. Quotes outside the no-arbitrage
+    bounds (at or below intrinsic, at or above the spot/strike bound) or with T <= 0 are NaN."""
+    P, S, K, T, r, q = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (price, spot, strike, T, r, q)))
+    w = np.broadcast_to(option_sign(option_type), P.shape)
+    Tl = np.where(T > 0, T, 1.0)
+    S_adj = S * np.exp(-q * Tl)
+    K_adj = K * np.exp(-r * Tl)
+
+    # out-of-the-money equivalent: calls above the forward, puts below it
+    call = P + np.where(w > 0, 0.0, S_adj - K_adj)
+    otm_sign = np.where(K_adj >= S_adj, 1.0, -1.0)
+    target = np.where(otm_sign > 0, call, call - S_adj + K_adj)
+    upper = np.where(otm_sign > 0, S_adj, K_adj)
+    valid = (T > 0) & np.isfinite(P) & (target > 0) & (target < upper)
+
+    # Corrado–Miller initial guess on the call-equivalent price
+    half_gap = 0.5 * (S_adj - K_adj)
+    disc = np.maximum((call - half_gap) ** 2 - (S_adj - K_adj) ** 2 / np.pi, 0.0)
+    guess = _SQRT_2PI / (S_adj + K_adj) * (call - half_gap + np.sqrt(disc)) / np.sqrt(Tl)
+    sigma = np.where(np.isfinite(guess) & (guess > 1e-3), np.minimum(guess, 5.0), 0.3)
+
+    # iterate only on the quotes that have not converged yet
+    sigma = sigma.ravel().copy()
+    idx = np.flatnonzero(valid)
+    lo = np.full(idx.size, 1e-8)
+    hi = np.full(idx.size, 10.0)
+    log_fk, sqrtT, sgn = np.log(S_adj / K_adj).ravel()[idx], np.sqrt(Tl).ravel()[idx], otm_sign.ravel()[idx]
+    Sa, Ka, tgt = S_adj.ravel()[idx], K_adj.ravel()[idx], target.ravel()[idx]
+    for _ in range(max_iter):
+        if not idx.size:
+            break
+        sig = sigma[idx]
+        sd = sig * sqrtT
+        d1 = log_fk / sd + 0.5 * sd
+        d2 = d1 - sd
+        f = sgn * (Sa * ndtr(sgn * d1) - Ka * ndtr(sgn * d2)) - tgt
+        vega = Sa * np.exp(-0.5 * d1 * d1) / _SQRT_2PI * sqrtT
+        hi = np.where(f > 0, sig, hi)
+        lo = np.where(f < 0, sig, lo)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = f / vega
+            volga_term = 1.0 - 0.5 * newton * d1 * d2 / sig
+            proposal = sig - np.where(volga_term > 0.5, newton / volga_term, newton)
+        bad = ~np.isfinite(proposal) | (proposal <= lo) | (proposal >= hi)
+        done = np.abs(f) <= tol * np.maximum(tgt, 1e-12)
+        sigma[idx] = np.where(done, sig, np.where(bad, 0.5 * (lo + hi), proposal))
+        keep = ~done
+        idx, lo, hi, log_fk, sqrtT, sgn, Sa, Ka, tgt = (a[keep] for a in (idx, lo, hi, log_fk, sqrtT, sgn, Sa, Ka, tgt))
+    sigma = sigma.reshape(P.shape)
+    return np.where(valid, sigma, np.nan)
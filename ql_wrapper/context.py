@@ -0,0 +1,109 @@
+"""Valuation contexts: an explicit valuation date, day count and calendar in place of global Settings."""
+import threading
+from contextlib import contextmanager
+from QuantLib import (Settings, Date, Actual365Fixed, Actual360, ActualActual, Thirty360, NullCalendar, TARGET,
+                      UnitedStates, UnitedKingdom)
+
+# QuantLib's evaluation date is process-global; pricing that depends on it runs under this lock
+_SETTINGS_LOCK = threading.RLock()
+# depth of keep_evaluation_date() blocks; only touched while holding _SETTINGS_LOCK
+_held = 0
+
+# day counters and calendars that can be rebuilt by name after pickling
+_DAY_COUNTS = {dc.name(): dc for dc in (Actual365Fixed(), Actual360(), ActualActual(ActualActual.ISDA),
+                                         Thirty360(Thirty360.BondBasis))}
+_CALENDARS = {cal.name(): cal for cal in (NullCalendar(), TARGET(), UnitedStates(UnitedStates.NYSE),
+                                          UnitedKingdom())}
+
+
+@contextmanager
+def keep_evaluation_date():
+    """Restore the global evaluation date once on exit, however many contexts were activated inside.
+
+    The Settings lock is held for the whole block, and activations inside it leave the date
+    where they put it, so repeated pricing on one date inside the block stays cached."""
+    global _held
+    with _SETTINGS_LOCK:
+        settings = Settings.instance()
+        previous = settings.evaluationDate
+        _held += 1
+        try:
+            yield
+        finally:
+            _held -= 1
+            if settings.evaluationDate != previous:
+                settings.evaluationDate = previous
+
+
+class ValuationContext:
+    """Valuation date, day count and calendar held by a market or model.
+
+    A context built without a date follows the global Settings evaluation date; one with a
+    date is pinned to it. Code that reads QuantLib's global date (instrument expiry checks,
+    engines) runs inside activate(), which sets Settings to the pinned date under a lock
+    shared by all contexts and restores it on exit, so books on different dates can be priced
+    from several threads without moving the date seen by unpinned readers. Wrap batches of
+    pricing in keep_evaluation_date() to switch and restore the date once for the batch."""
+
+    def __init__(self, date: Date | None = None, day_count=None, calendar=None):
+        self._date = None if date is None else Date(date.serialNumber())
+        self.day_count = day_count or Actual365Fixed()
+        self.calendar = calendar or NullCalendar()
+
+    @classmethod
+    def today(cls, day_count=None, calendar=None) -> "ValuationContext":
+        """A context pinned to the current global evaluation date."""
+        return cls(Settings.instance().evaluationDate, day_count, calendar)
+
+    @property
+    def date(self) -> Date:
+        return Settings.instance().evaluationDate if self._date is None else self._date
+
+    @date.setter
+    def date(self, value: Date) -> None:
+        self._date = Date(value.serialNumber())
+
+    @property
+    def pinned(self) -> bool:
+        return self._date is not None
+
+    def year_fraction(self, d: Date) -> float:
+        """Year fraction from the valuation date to d under the context's day count."""
+        return self.day_count.yearFraction(self.date, d)
+
+    @contextmanager
+    def activate(self):
+        """Hold the global Settings lock with the evaluation date set to this context's date.
+
+        The date is only set when it differs and is restored on exit, unless an enclosing
+        keep_evaluation_date() block restores it instead. Each change notifies every QuantLib
+        observer of the date, so pricing off the global date outside such a block recalculates.
+        Unpinned contexts take the lock and leave the date as it is."""
+        with _SETTINGS_LOCK:
+            settings = Settings.instance()
+            previous = settings.evaluationDate
+            switched = self._date is not None and previous != self._date
+            if switched:
+                settings.evaluationDate = self._date
+            try:
+                yield self
+            finally:
+                if switched and not _held:
+                    settings.evaluationDate = previous
+
+    def __getstate__(self):
+        for name, table in (("day count", _DAY_COUNTS), ("calendar", _CALENDARS)):
+            value = self.day_count if name == "day count" else self.calendar
+            if value.name() not in table:
+                raise ValueError(f"Cannot pickle a context with {name} {value.name()!r}")
+        return (None if self._date is None else self._date.serialNumber(), self.day_count.name(), self.calendar.name())
+
+    def __setstate__(self, state):
+        serial, day_count, calendar = state
+        self._date = None if serial is None else Date(serial)
+        self.day_count = _DAY_COUNTS[day_count]
+        self.calendar = _CALENDARS[calendar]
+
+    def __repr__(self):
+        date = self._date.ISO() if self._date is not None else "evaluationDate"
+        return f"ValuationContext({date}, {self.day_count.name()}, {self.calendar.name()})"
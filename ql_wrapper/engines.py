@@ -0,0 +1,119 @@
+"""Engine selection: measured cost/error profiles per pricing engine and budget-driven choice among them."""
+import time
+import numpy as np
+from QuantLib import Option as QLOption
+from .instruments import Option
+from .models import BlackScholesModel, FiniteDifferenceModel, MonteCarloModel
+
+STYLES = ("European", "American")
+
+
+class _MarketMonteCarlo(MonteCarloModel):
+    """MonteCarloModel that reads spot, r, q and the flat vol from a live MarketParams on every price."""
+
+    def __init__(self, market):
+        super().__init__(market.spot, market.r, market.vol, market.q, context=market.context)
+        self.market = market
+
+    def price(self, instrument, num_paths, **kwargs):
+        mkt = self.market
+        self.spot, self.r, self.q, self.vol = mkt.spot, mkt.r, mkt.q, mkt.vol
+        return super().price(instrument, num_paths, **kwargs)
+
+
+# name -> (styles, model factory taking a MarketParams, extra price() kwargs)
+ENGINES = {
+    "analytic": (("European",), lambda mkt: BlackScholesModel(market=mkt), {}),
+    "baw": (("American",), lambda mkt: BlackScholesModel(market=mkt), {}),
+    "binomial-100": (("American",), lambda mkt: BlackScholesModel(market=mkt, engine_type="binomial", binomial_steps=100), {}),
+    "binomial-400": (("American",), lambda mkt: BlackScholesModel(market=mkt, engine_type="binomial", binomial_steps=400), {}),
+    "fd-100": (STYLES, lambda mkt: FiniteDifferenceModel(mkt, 100, 100), {}),
+    "fd-400": (STYLES, lambda mkt: FiniteDifferenceModel(mkt, 400, 400), {}),
+    "fd-auto": (STYLES, lambda mkt: FiniteDifferenceModel(mkt, tolerance=1e-4), {}),
+    "mc-100k": (("European",), _MarketMonteCarlo, {"num_paths": 100_000, "antithetic": True, "seed": 1}),
+}
+
+
+def calibration_set(market, moneyness=(0.8, 0.9, 1.0, 1.1, 1.2), days=(30, 91, 182, 365),
+                    option_types=(QLOption.Call, QLOption.Put), style="European"):
+    """Options spanning moneyness (strike / spot), maturities in days and types."""
+    return [Option(market.spot * m, market.today + int(d), t, style=style)
+            for m in moneyness for d in days for t in option_types]
+
+
+def calibrate(market, engines=None, reference_tolerance=1e-6, **set_kwargs):
+    """Measure each engine's cost and error on a calibration set for each style it supports.
+
+    Errors are absolute price differences to a reference: closed form for Europeans, and
+    FiniteDifferenceModel.price_to_tolerance(reference_tolerance) for Americans. Each
+    engine prices every contract once on a fresh model, so the measured cost includes
+    building the QuantLib options. Returns a list of dicts (engine, style, seconds per
+    price, max and mean error), cheapest first. MC engines are only included for flat-vol markets."""
+    names = list(engines or ENGINES)
+    if market.vol is None:
+        names = [n for n in names if not n.startswith("mc")]
+    profiles = []
+    for style in STYLES:
+        options = calibration_set(market, style=style, **set_kwargs)
+        if style == "European":
+            reference_model = BlackScholesModel(market=market)
+            reference = np.array([reference_model.price(o) for o in options])
+        else:
+            reference_model = FiniteDifferenceModel(market)
+            reference = np.array([reference_model.price_to_tolerance(o, reference_tolerance, max_grid=1600)[0]
+                                  for o in options])
+        for name in names:
+            styles, factory, kwargs = ENGINES[name]
+            if style not in styles:
+                continue
+            model = factory(market)
+            start = time.perf_counter()
+            prices = np.array([model.price(o, **kwargs) for o in options])
+            seconds = (time.perf_counter() - start) / len(options)
+            errors = np.abs(prices - reference)
+            profiles.append({"engine": name, "style": style, "seconds": seconds,
+                             "error": float(errors.max()), "mean_error": float(errors.mean())})
+    return sorted(profiles, key=lambda p: p["seconds"])
+
+
+def select_engine(profiles, style, tolerance, latency=None):
+    """The cheapest profiled engine for `style` whose max error is within tolerance (and
+    whose cost per price is within latency seconds, if given)."""
+    fits = [p for p in profiles if p["style"] == style and p["error"] <= tolerance
+            and (latency is None or p["seconds"] <= latency)]
+    if not fits:
+        raise ValueError(f"No calibrated {style} engine meets tolerance={tolerance}, latency={latency}")
+    return min(fits, key=lambda p: p["seconds"])
+
+
+class EngineSelector:
+    """A pricing model that routes each option to the cheapest engine meeting an accuracy budget.
+
+    tolerance is an absolute price error, or a mode name from MODES; latency optionally caps
+    the cost per price in seconds. Profiles come from calibrate(market) unless supplied,
+    so one calibration can serve several selectors (e.g. intraday and end of day)."""
+
+    MODES = {"fast": 1e-1, "accurate": 1e-4}
+
+    def __init__(self, market, tolerance="fast", latency=None, profiles=None):
+        if isinstance(tolerance, str):
+            if tolerance not in self.MODES:
+                raise ValueError(f"Unknown mode: {tolerance} (expected one of {tuple(self.MODES)})")
+            tolerance = self.MODES[tolerance]
+        self.market = market
+        self.tolerance = float(tolerance)
+        self.latency = latency
+        self.profiles = profiles if profiles is not None else calibrate(market)
+        self.engines = {style: select_engine(self.profiles, style, self.tolerance, latency)["engine"]
+                        for style in STYLES}
+        self._models = {}
+
+    def _model(self, style):
+        name = self.engines[style]
+        if name not in self._models:
+            self._models[name] = ENGINES[name][1](self.market)
+        return self._models[name], ENGINES[name][2]
+
+    def price(self, instrument) -> float:
+        model, kwargs = self._model(getattr(instrument, "style", "European"))
+        return model.price(instrument, **kwargs)
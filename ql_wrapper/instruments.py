@@ -1,11 +1,64 @@
-from QuantLib import Date, Option as QLOption
+from QuantLib import Date, Option as QLOption, Observer
 from typing import Optional, Any, Dict
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+import numpy as np
+from .market import MarketParams
+from .paths import AsianPayoff, BarrierPayoff, LookbackPayoff
+from .analytic import option_sign
+from .context import keep_evaluation_date
+
+
+class _Serial(int):
+    """A QuantLib Date serial number in pickled instrument state."""
+
+
+def _pack_dates(value):
+    if isinstance(value, Date):
+        return _Serial(value.serialNumber())
+    if isinstance(value, list):
+        return [_pack_dates(v) for v in value]
+    return value
+
+
+def _unpack_dates(value):
+    if isinstance(value, _Serial):
+        return Date(int(value))
+    if isinstance(value, list):
+        return [_unpack_dates(v) for v in value]
+    return value
 
 
 class Instrument:
+    __slots__ = ("notional", "maturity", "model", "_meta")
+
     def __init__(self, notional, maturity: Date, model: Optional[Any] = None, **kwargs: Any) -> None:
         self.notional = float(notional); self.maturity = maturity; self.model = model
-        self.meta: Dict[str, Any] = dict(kwargs)
+        self._meta: Optional[Dict[str, Any]] = dict(kwargs) if kwargs else None
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        """Free-form extra attributes (the constructor's **kwargs), allocated on first use."""
+        if self._meta is None:
+            self._meta = {}
+        return self._meta
+
+    def __getstate__(self):
+        """Picklable state: slot values with Dates as serial numbers. The model is not carried
+        (it holds QuantLib engines); set it again after unpickling."""
+        state = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if hasattr(self, name):
+                    state[name] = _pack_dates(getattr(self, name))
+        state["model"] = None
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, _unpack_dates(value))
 
     def set_model(self, model: Any) -> None:
         self.model = model
@@ -45,9 +98,11 @@ class Instrument:
 
     
 class Option(Instrument):
+    __slots__ = ("strike", "option_type", "underlying", "style")
+
     def __init__(self, strike, maturity_date, option_type, style="European", underlying="Equity", pricing_model=None, **kwargs):
         super().__init__(notional=1.0, maturity=maturity_date, model=pricing_model, **kwargs)
-        self.strike = float(strike)
+        self.strike = self._strike(strike)
         self.option_type = option_type
         self.underlying = underlying
         self.style = style
@@ -55,6 +110,15 @@ class Option(Instrument):
             raise ValueError(f"Unsupported option style: {self.style}")
         if self.underlying not in {"Equity", "FX"}:
             raise ValueError(f"Unsupported underlying type: {self.underlying}")
+
+    @staticmethod
+    def _strike(strike):
+        return float(strike)
+
+    @property
+    def key(self):
+        """Hashable value identity (strike, maturity serial, type, style, underlying), e.g. for cache keys."""
+        return (self.strike, self.maturity.serialNumber(), int(self.option_type), self.style, self.underlying)
         
 
     def delta(self, model=None, **kwargs):
@@ -92,3 +156,307 @@ class Option(Instrument):
             if isinstance(g, dict) and "vega" in g:
                 return g["vega"]
         raise AttributeError("Model does not implement vega() or greeks()")
+
+
+class PathDependentOption(Option, ABC):
+    """European-exercise option whose payoff depends on the spot at a list of fixing dates.
+
+    The strike may be None for payoffs without one (floating-strike lookbacks)."""
+    __slots__ = ("fixing_dates",)
+
+    def __init__(self, strike, maturity_date, option_type, fixing_dates, underlying="Equity", pricing_model=None, **kwargs):
+        super().__init__(strike, maturity_date, option_type, style="European", underlying=underlying,
+                         pricing_model=pricing_model, **kwargs)
+        self.fixing_dates = sorted(fixing_dates)
+        if not self.fixing_dates:
+            raise ValueError("At least one fixing date is required")
+        if self.fixing_dates[-1] > maturity_date:
+            raise ValueError("Fixing dates must not fall after maturity")
+
+    @staticmethod
+    def _strike(strike):
+        return None if strike is None else float(strike)
+
+    @property
+    def key(self):
+        """Option.key prefixed with the class name and followed by the fixing date serials."""
+        return (type(self).__name__,) + super().key + (tuple(d.serialNumber() for d in self.fixing_dates),)
+
+    @abstractmethod
+    def path_payoff(self):
+        """The payoff accumulator (paths.AsianPayoff, BarrierPayoff, LookbackPayoff) for this option."""
+
+
+class AsianOption(PathDependentOption):
+    __slots__ = ("average",)
+
+    def __init__(self, strike, maturity_date, option_type, fixing_dates, average="arithmetic", **kwargs):
+        super().__init__(strike, maturity_date, option_type, fixing_dates, **kwargs)
+        self.average = average
+        self.path_payoff()  # validate
+
+    @property
+    def key(self):
+        return super().key + (self.average,)
+
+    def path_payoff(self):
+        return AsianPayoff(self.strike, self.option_type, self.average)
+
+
+class BarrierOption(PathDependentOption):
+    __slots__ = ("barrier", "barrier_type", "rebate")
+
+    def __init__(self, strike, maturity_date, option_type, barrier, barrier_type, fixing_dates, rebate=0.0, **kwargs):
+        super().__init__(strike, maturity_date, option_type, fixing_dates, **kwargs)
+        self.barrier = float(barrier)
+        self.barrier_type = barrier_type
+        self.rebate = float(rebate)
+        self.path_payoff()  # validate
+
+    @property
+    def key(self):
+        return super().key + (self.barrier, self.barrier_type, self.rebate)
+
+    def path_payoff(self):
+        return BarrierPayoff(self.strike, self.option_type, self.barrier, self.barrier_type, self.rebate)
+
+
+class LookbackOption(PathDependentOption):
+    __slots__ = ()
+
+    def __init__(self, maturity_date, option_type, fixing_dates, strike=None, **kwargs):
+        """Fixed-strike lookback, or floating-strike when strike is None."""
+        super().__init__(strike, maturity_date, option_type, fixing_dates, **kwargs)
+
+    def path_payoff(self):
+        return LookbackPayoff(self.option_type, self.strike)
+
+
+class Portfolio:
+    """A book of vanilla option positions held as NumPy columns.
+
+    Columns: strike, maturity (Date serial numbers), option_type (QuantLib Option.Call/Put),
+    style, underlying and quantity. Pricing groups the positions by style (one engine per
+    group), prices each distinct contract once and scatters the results back to positions."""
+
+    STYLES = ("European", "American")
+    UNDERLYINGS = ("Equity", "FX")
+
+    def __init__(self, strikes, maturities, option_types, quantities=None, styles="European", underlyings="Equity"):
+        self.strike = np.array(strikes, dtype=float, ndmin=1)
+        n = self.strike.size
+        maturities = np.asarray(maturities)
+        if maturities.dtype == object:
+            maturities = np.array([d.serialNumber() if isinstance(d, Date) else int(d) for d in maturities.ravel()])
+        self.maturity = np.broadcast_to(maturities.astype(np.int64), (n,)).copy()
+        self.option_type = np.where(np.broadcast_to(option_sign(option_types), (n,)) > 0,
+                                    int(QLOption.Call), int(QLOption.Put))
+        self.quantity = np.ones(n) if quantities is None else np.broadcast_to(np.asarray(quantities, dtype=float), (n,)).copy()
+        self.style = np.broadcast_to(np.asarray(styles, dtype=str), (n,)).copy()
+        self.underlying = np.broadcast_to(np.asarray(underlyings, dtype=str), (n,)).copy()
+        if not np.isin(self.style, self.STYLES).all():
+            raise ValueError(f"Unsupported option style in {sorted(set(self.style) - set(self.STYLES))}")
+        if not np.isin(self.underlying, self.UNDERLYINGS).all():
+            raise ValueError(f"Unsupported underlying type in {sorted(set(self.underlying) - set(self.UNDERLYINGS))}")
+
+    @classmethod
+    def from_options(cls, options, quantities=None):
+        return cls([o.strike for o in options], [o.maturity.serialNumber() for o in options],
+                   [int(o.option_type) for o in options], quantities,
+                   [o.style for o in options], [o.underlying for o in options])
+
+    def __len__(self):
+        return self.strike.size
+
+    def option(self, i) -> Option:
+        """Position i as a standalone Option."""
+        return Option(self.strike[i], Date(int(self.maturity[i])), int(self.option_type[i]),
+                      style=str(self.style[i]), underlying=str(self.underlying[i]))
+
+    def _groups(self):
+        """Yield (style, positions, distinct contract columns, inverse index) per engine group."""
+        for style in self.STYLES:
+            idx = np.flatnonzero(self.style == style)
+            if idx.size:
+                keys = np.column_stack([self.strike[idx], self.maturity[idx], self.option_type[idx]])
+                contracts, inverse = np.unique(keys, axis=0, return_inverse=True)
+                yield style, idx, contracts, inverse.ravel()
+
+    def price(self, model, **kwargs):
+        """Per-position unit prices. Uses model.price_arrays when available, model.price_batch
+        for european groups and model.price_american for american ones, and otherwise one
+        model.price call per distinct contract."""
+        out = np.empty(len(self))
+        for style, idx, contracts, inverse in self._groups():
+            K, m, t = contracts[:, 0], contracts[:, 1].astype(np.int64), contracts[:, 2].astype(int)
+            if hasattr(model, "price_arrays"):
+                values = model.price_arrays(K, m, t, style, **kwargs)
+            else:
+                options = [Option(k, Date(int(d)), int(c), style=style) for k, d, c in zip(K, m, t)]
+                if style == "European" and hasattr(model, "price_batch"):
+                    values = np.array([p for p, _ in model.price_batch(options, **kwargs)])
+                elif style == "American" and hasattr(model, "price_american"):
+                    values = np.array([p for p, _ in model.price_american(options, **kwargs)])
+                else:
+                    values = np.array([model.price(o, **kwargs) for o in options])
+            out[idx] = np.asarray(values)[inverse]
+        return out
+
+    def price_parallel(self, market, model_factory, workers=None, chunk_size=None, **kwargs):
+        """Per-position unit prices computed in a process pool.
+
+        Each worker rebuilds the market once from market.snapshot() and builds its model
+        with model_factory(market=...). A model class such as FiniteDifferenceModel works,
+        as does a functools.partial of one; the factory must be picklable. The distinct
+        contracts of each style group are then priced in chunks of chunk_size (by default
+        about four chunks per worker). Extra kwargs go to the workers' Portfolio.price."""
+        workers = workers or os.cpu_count() or 1
+        out = np.empty(len(self))
+        with ProcessPoolExecutor(workers, initializer=_init_pricing_worker,
+                                 initargs=(market.snapshot(), model_factory)) as pool:
+            jobs = []
+            for style, idx, contracts, inverse in self._groups():
+                step = chunk_size or max(math.ceil(len(contracts) / (4 * workers)), 1)
+                futures = [pool.submit(_price_contracts, contracts[a:a + step], style, kwargs)
+                           for a in range(0, len(contracts), step)]
+                jobs.append((idx, inverse, futures))
+            for idx, inverse, futures in jobs:
+                out[idx] = np.concatenate([f.result() for f in futures])[inverse]
+        return out
+
+    def value(self, model, **kwargs) -> float:
+        """Total book value, sum of quantity * price."""
+        return float(self.quantity @ self.price(model, **kwargs))
+
+    def greeks(self, model, **kwargs):
+        """Per-position greeks as a dict of arrays: model.greeks_arrays per style group, or
+        model.greeks_american for american groups, else per-contract model.greeks."""
+        out = {}
+        for style, idx, contracts, inverse in self._groups():
+            K, m, t = contracts[:, 0], contracts[:, 1].astype(np.int64), contracts[:, 2].astype(int)
+            if hasattr(model, "greeks_arrays"):
+                values = model.greeks_arrays(K, m, t, style, **kwargs)
+            elif style == "American" and hasattr(model, "greeks_american"):
+                values = model.greeks_american([Option(k, Date(int(d)), int(c), style=style) for k, d, c in zip(K, m, t)],
+                                               **kwargs)
+            else:
+                rows = [model.greeks(Option(k, Date(int(d)), int(c), style=style), **kwargs) for k, d, c in zip(K, m, t)]
+                values = {g: np.array([row[g] for row in rows]) for g in rows[0]}
+            for g, v in values.items():
+                out.setdefault(g, np.zeros(len(self)))[idx] = np.asarray(v)[inverse]
+        return out
+
+    def total_greeks(self, model, **kwargs):
+        """Quantity-weighted book greeks."""
+        return {g: float(self.quantity @ v) for g, v in self.greeks(model, **kwargs).items()}
+
+
+# per-process state of Portfolio.price_parallel workers
+_WORKER = {}
+
+
+def _init_pricing_worker(snapshot, model_factory):
+    _WORKER["model"] = model_factory(market=MarketParams.from_snapshot(snapshot))
+
+
+def _price_contracts(contracts, style, kwargs):
+    book = Portfolio(contracts[:, 0], contracts[:, 1].astype(np.int64), contracts[:, 2].astype(int), styles=style)
+    return book.price(_WORKER["model"], **kwargs)
+
+
+class IncrementalBook:
+    """Positions kept valued incrementally: after a market move only the affected ones are repriced.
+
+    Each distinct contract (per model) holds the model's QuantLib option and an observer on
+    it and on the model's process, so the QuantLib dependency graph (spot quote, r/q curves,
+    vol handle, evaluation date) records what it depends on. A notification marks the
+    contract dirty; revalue() reprices the dirty contracts and moves the total by the change
+    in their value. Models must build QuantLib options on a process (BlackScholesModel,
+    FiniteDifferenceModel) and should have pinned contexts: revalue() switches the global
+    date once per context, and the notifications from those switches are ignored."""
+
+    def __init__(self):
+        self._contracts = {}   # (id(model), option.key) -> index into the lists below
+        self._ql_options = []
+        self._observers = []
+        self._prices = []
+        self._quantities = []  # total quantity per contract
+        self._position_contract = []
+        self._position_quantity = []
+        self._dirty = set()
+        self._repricing = False  # set while the book itself switches the evaluation date
+        self.total = 0.0
+        self.last_repriced = 0
+
+    def __len__(self):
+        return len(self._position_contract)
+
+    def add(self, option, model, quantity=1.0) -> int:
+        """Add a position and return its index."""
+        quantity = float(quantity)
+        key = (id(model), option.key)
+        c = self._contracts.get(key)
+        if c is None:
+            ql_option = model._option(option)
+            c = self._contracts[key] = len(self._ql_options)
+            observer = Observer(lambda c=c: self._mark(c))
+            # the option relays date moves; market moves come from the process, which (unlike
+            # the lazy option) keeps notifying after the book's own date switches invalidate it
+            observer.registerWith(ql_option)
+            observer.registerWith(model.process)
+            self._ql_options.append(ql_option)
+            self._observers.append((observer, model))  # the model keeps the option's engine alive
+            self._repricing = True
+            try:
+                with model.context.activate():
+                    self._prices.append(float(ql_option.NPV()))
+            finally:
+                self._repricing = False
+            self._quantities.append(0.0)
+        self._quantities[c] += quantity
+        self.total += quantity * self._prices[c]
+        self._position_contract.append(c)
+        self._position_quantity.append(quantity)
+        return len(self._position_contract) - 1
+
+    def _mark(self, c):
+        if not self._repricing:
+            self._dirty.add(c)
+
+    @property
+    def dirty(self) -> int:
+        """Number of contracts waiting to be repriced."""
+        return len(self._dirty)
+
+    def revalue(self) -> float:
+        """Reprice the dirty contracts, update the total by their change and return it.
+
+        Contracts are grouped by their model's context, so the evaluation date is switched at
+        most once per group and restored once at the end."""
+        dirty = list(self._dirty)
+        groups = {}
+        for c in dirty:
+            context = self._observers[c][1].context
+            groups.setdefault(id(context), (context, []))[1].append(c)
+        self._repricing = True
+        try:
+            with keep_evaluation_date():
+                for context, contracts in groups.values():
+                    with context.activate():
+                        for c in contracts:
+                            new = float(self._ql_options[c].NPV())
+                            self.total += self._quantities[c] * (new - self._prices[c])
+                            self._prices[c] = new
+        finally:
+            self._repricing = False
+        self._dirty.difference_update(dirty)
+        self.last_repriced = len(dirty)
+        return self.total
+
+    def prices(self):
+        """Per-position unit prices as of the last revalue()."""
+        return np.array(self._prices)[np.array(self._position_contract, dtype=int)]
+
+    def values(self):
+        """Per-position values (quantity * price) as of the last revalue()."""
+        return np.array(self._position_quantity) * self.prices()
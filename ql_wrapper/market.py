@@ -1,19 +1,39 @@
 from typing import Optional, Union
-from QuantLib import RelinkableYieldTermStructureHandle, YieldTermStructureHandle, FlatForward, Actual365Fixed, RelinkableBlackVolTermStructureHandle, BlackVolTermStructureHandle, BlackConstantVol, Settings, QuoteHandle, SimpleQuote, NullCalendar
+from contextlib import contextmanager
+from itertools import islice
+import os
+import numpy as np
+from .context import ValuationContext
+from .vol_surface import build_vol_surface
+from QuantLib import Date, RelinkableQuoteHandle, RelinkableYieldTermStructureHandle, YieldTermStructureHandle, FlatForward, RelinkableBlackVolTermStructureHandle, BlackVolTermStructureHandle, BlackConstantVol, Settings, QuoteHandle, SimpleQuote, NullCalendar
 import csv
 
+# market CSV column -> MarketParams.update keyword
+_CSV_FIELDS = {"spot": "spot", "risk_free_rate": "r", "div_yield": "q", "vol": "vol"}
+
+
 class MarketParams:
-    def __init__(self, spot: float, risk_free_rate: float, div_yield: float = 0.0, vol: float | None = None, vol_handle=None):
+    def __init__(self, spot: float, risk_free_rate: float, div_yield: float = 0.0, vol: float | None = None, vol_handle=None,
+                 context: Optional[ValuationContext] = None):
         self.spot = float(spot)
         self._spot_quote = SimpleQuote(self.spot)
         self.r = float(risk_free_rate)
         self.q = float(div_yield)
         self.vol = None if vol is None else float(vol)
         
-        self.day_count = Actual365Fixed()
-        self.today = Settings.instance().evaluationDate
+        # curves are anchored at the context date; defaults to the current evaluation date, pinned.
+        # An unpinned context is copied and pinned, leaving the caller's to follow Settings
+        if context is None:
+            context = ValuationContext.today()
+        elif not context.pinned:
+            context = ValuationContext(context.date, context.day_count, context.calendar)
+        self.context = context
+        self.day_count = self.context.day_count
 
-        self._spot_handle = QuoteHandle(self._spot_quote)
+        self._spot_handle = RelinkableQuoteHandle(self._spot_quote)
+        self._batch_depth = 0
+        self._pending = {}  # handle attribute -> object to link on exit of the outermost batch
+        self._vol_chain = None  # (expiry serial, strike, iv) inputs of a chain-built surface
 
         # relinkable handles
         self._r_handle = RelinkableYieldTermStructureHandle()
@@ -45,6 +65,10 @@ class MarketParams:
         self._q_handle.linkTo(self._q_curve)
 
 
+    @property
+    def today(self):
+        return self.context.date
+
     @property
     def spot_handle(self) -> QuoteHandle:
         return self._spot_handle
@@ -62,50 +86,157 @@ class MarketParams:
         return self._vol_handle
        
 
+    def _link(self, handle: str, target) -> None:
+        """Link one of the market's relinkable handles now, or on exit of the outermost batch()."""
+        if self._batch_depth:
+            self._pending[handle] = target
+        else:
+            getattr(self, handle).linkTo(target)
+
     def set_spot(self, new_spot: float):
         new_spot = float(new_spot)
-        self._spot_quote.setValue(float(new_spot))
+        if self._batch_depth:
+            # a detached quote, linked once when the batch exits
+            self._spot_quote = SimpleQuote(new_spot)
+            self._link("_spot_handle", self._spot_quote)
+        else:
+            self._spot_quote.setValue(float(new_spot))
         self.spot = float(new_spot)
     
+    @contextmanager
+    def batch(self):
+        """Apply several set_* calls as one market move.
+
+        New quotes and curves are built detached and each changed handle is relinked once
+        when the outermost batch exits, so dependents (process, engine, cached instrument)
+        see one move. Only this market is affected; handles read inside the block still
+        show the previous market."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                pending, self._pending = self._pending, {}
+                for handle, target in pending.items():
+                    getattr(self, handle).linkTo(target)
+
+    def update(self, spot: Optional[float] = None, r: Optional[float] = None, q: Optional[float] = None,
+               vol: Optional[float] = None) -> None:
+        """Set any of spot, rate, dividend yield and flat vol with a single round of notifications."""
+        with self.batch():
+            if spot is not None:
+                self.set_spot(spot)
+            if r is not None:
+                self.set_rate(r)
+            if q is not None:
+                self.set_div(q)
+            if vol is not None:
+                self.set_vol(vol)
+
     def set_rate(self, new_r: float):
         self.r = float(new_r)
         self._r_curve = FlatForward(self.today, self.r, self.day_count)
-        self._r_handle.linkTo(self._r_curve)
+        self._link("_r_handle", self._r_curve)
     
     def set_div(self, new_q: float):
         self.q = float(new_q)
         self._q_curve = FlatForward(self.today, self.q, self.day_count)
-        self._q_handle.linkTo(self._q_curve)
+        self._link("_q_handle", self._q_curve)
     
     def set_vol(self, new_vol: float):
         self.vol = float(new_vol)
+        self._vol_chain = None
         self._vol_surface = BlackConstantVol(self.today, NullCalendar(), self.vol, self.day_count)
-        self._vol_handle.linkTo(self._vol_surface)
+        self._link("_vol_handle", self._vol_surface)
     
+    def set_date(self, date) -> None:
+        """Roll the valuation date: re-anchor the flat curves (and flat vol) at `date` in one batch.
+
+        Models sharing this market's context see the new date. A user-supplied vol surface
+        keeps its own reference date."""
+        with self.batch():
+            self.context.date = date
+            self.set_rate(self.r)
+            self.set_div(self.q)
+            if isinstance(self._vol_surface, BlackConstantVol) and self.vol is not None:
+                self.set_vol(self.vol)
+
     def set_vol_surface(self, surface):
         # accepts a surface OR a handle
         # If given a handle, link directly; if given a surface, wrap it
+        self._vol_chain = None
         if isinstance(surface, BlackVolTermStructureHandle):
             self._vol_surface = None
-            self._vol_handle.linkTo(surface.currentLink())
+            self._link("_vol_handle", surface.currentLink())
         else:
             self._vol_surface = surface
-            self._vol_handle.linkTo(self._vol_surface)
+            self._link("_vol_handle", self._vol_surface)
 
     
+    def set_vol_chain(self, chain_data) -> None:
+        """Build the vol surface from (expiry, strike, iv) rows at the market's context and keep the
+        rows, so snapshots can rebuild it."""
+        rows = [(d.serialNumber(), float(k), float(iv)) for d, k, iv in chain_data]
+        self.set_vol_surface(build_vol_surface([(Date(d), k, iv) for d, k, iv in rows], self.context))
+        self._vol_chain = rows
+
+    def snapshot(self) -> dict:
+        """Plain, picklable market state: levels, context and the flat vol or vol-chain inputs.
+
+        Surfaces linked directly (set_vol_surface / vol_handle) cannot be captured; build them
+        with set_vol_chain instead."""
+        if self._vol_chain is None and not isinstance(self._vol_surface, BlackConstantVol):
+            raise ValueError("Vol surface inputs are unknown; use set_vol_chain() to make the market snapshotable")
+        return {"spot": self.spot, "r": self.r, "q": self.q, "vol": self.vol, "context": self.context,
+                "vol_chain": None if self._vol_chain is None else list(self._vol_chain)}
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict) -> "MarketParams":
+        """Rebuild a MarketParams (with fresh QuantLib objects) from snapshot()."""
+        mkt = cls(snapshot["spot"], snapshot["r"], snapshot["q"], snapshot["vol"], context=snapshot["context"])
+        if snapshot["vol_chain"] is not None:
+            mkt.set_vol_chain([(Date(d), k, iv) for d, k, iv in snapshot["vol_chain"]])
+        return mkt
+
+    def __reduce__(self):
+        return (self.from_snapshot, (self.snapshot(),))
+
     def load_from_csv(self, filepath: str) -> None:
+        self.apply(next(self.iter_csv(filepath), {}))
+
+    @staticmethod
+    def iter_csv(filepath: str):
+        """Lazily yield one snapshot dict per row of a market CSV file.
+
+        Snapshots hold the non-empty market columns of the row, under the update() keywords
+        (spot, r, q, vol)."""
         with open(filepath, newline="") as f:
-            row = next(csv.DictReader(f))
-            lower = {k.strip().lower(): v for k, v in row.items()}
-            if "spot" in lower and lower["spot"]:
-                self.set_spot(float(lower["spot"]))
-            if "risk_free_rate" in lower and lower["risk_free_rate"]:
-                self.set_rate(float(lower["risk_free_rate"]))
+            reader = csv.reader(f)
+            header = [h.strip().lower() for h in next(reader, [])]
+            columns = [(i, _CSV_FIELDS[h]) for i, h in enumerate(header) if h in _CSV_FIELDS]
+            for row in reader:
+                yield {name: float(row[i]) for i, name in columns if i < len(row) and row[i].strip()}
 
-            if "div_yield" in lower and lower['div_yield']:
-                self.set_div(float(lower['div_yield']))
-            if "vol" in lower and lower['vol']:
-                self.set_vol(float(lower['vol']))
+    def apply(self, snapshot) -> None:
+        """Apply a snapshot dict (any of spot, r, q, vol) as one batched update."""
+        self.update(**{k: snapshot[k] for k in ("spot", "r", "q", "vol") if k in snapshot})
 
+    def replay(self, source, instruments, model=None, coalesce: int = 1):
+        """Replay market snapshots and yield (snapshot, prices) as the book is revalued.
 
-  
\ No newline at end of file
+        `source` is a market CSV path (streamed with iter_csv) or any iterable of snapshot
+        dicts. With coalesce=n, each run of up to n snapshots is merged (later fields win),
+        applied once and priced once, so fast feeds are not repriced on every tick. Prices
+        come from `model`, or from each instrument's own model when model is None."""
+        snapshots = self.iter_csv(source) if isinstance(source, (str, os.PathLike)) else iter(source)
+        step = max(int(coalesce), 1)
+        while True:
+            group = list(islice(snapshots, step))
+            if not group:
+                return
+            merged = {}
+            for snapshot in group:
+                merged.update(snapshot)
+            self.apply(merged)
+            yield merged, np.array([inst.price(model) for inst in instruments])
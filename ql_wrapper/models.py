@@ -1,17 +1,75 @@
-from QuantLib import Settings, QuoteHandle, SimpleQuote, Actual365Fixed, YieldTermStructureHandle, FlatForward, BlackVolTermStructureHandle, BlackConstantVol, NullCalendar, BlackScholesProcess, PlainVanillaPayoff, EuropeanExercise, VanillaOption, AnalyticEuropeanEngine, BlackScholesMertonProcess, AmericanExercise, BaroneAdesiWhaleyApproximationEngine, BinomialVanillaEngine, FdBlackScholesVanillaEngine
+from QuantLib import QuoteHandle, SimpleQuote, YieldTermStructureHandle, FlatForward, BlackVolTermStructureHandle, BlackConstantVol, NullCalendar, BlackScholesProcess, PlainVanillaPayoff, EuropeanExercise, VanillaOption, AnalyticEuropeanEngine, BlackScholesMertonProcess, AmericanExercise, BaroneAdesiWhaleyApproximationEngine, BinomialVanillaEngine, FdBlackScholesVanillaEngine
 from QuantLib import Date, Option as QLOption
+from QuantLib import (FdmMesherComposite, FdmBlackScholesMesher, FdmLogInnerValue, FdmStepConditionComposite, DividendSchedule,
+                      FdmSolverDesc, FdmBoundaryConditionSet, FdmBlackScholesOp, Fdm1DimSolver, FdmSchemeDesc, nullDouble)
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 import math
 import numpy as np
+from .sampling import sobol_normal_blocks
+from .paths import GBMPathGenerator
+from types import SimpleNamespace
+from .analytic import bs_price, bs_greeks
+from .context import ValuationContext
+
+def _instrument_key(instrument, style):
+    return (float(instrument.strike), instrument.maturity.serialNumber(), int(instrument.option_type), style)
+
+
+class _OptionCache:
+    """Bounded LRU of objects built per contract: QuantLib VanillaOptions with their engines
+    attached, or FiniteDifferenceModel spot profiles.
+
+    Cached options observe the model's process (and through it the market handles), so one
+    only recalculates when an input it depends on has notified a change. Profiles are
+    solved once and keyed by the market state they were solved on."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._options = OrderedDict()
+
+    def get(self, key, build):
+        option = self._options.get(key)
+        if option is not None:
+            self._options.move_to_end(key)
+            return option
+        option = build()
+        if self.maxsize > 0:
+            self._options[key] = option
+            while len(self._options) > self.maxsize:
+                self._options.popitem(last=False)
+        return option
+
+    def __len__(self):
+        return len(self._options)
+
+    def pop(self, key):
+        self._options.pop(key, None)
+
+    def clear(self):
+        self._options.clear()
+
 
 class BlackScholesModel:
-    def __init__(self, spot=None, risk_free_rate=None, volatility=None, market=None, engine_type: str = "analytic", binomial_steps: int = 201):
+    # American engine: Barone-Adesi-Whaley approximation or a CRR binomial tree of binomial_steps;
+    # Europeans are always priced in closed form
+    ENGINE_TYPES = ("analytic", "binomial")
+
+    def __init__(self, spot=None, risk_free_rate=None, volatility=None, market=None, engine_type: str = "analytic", binomial_steps: int = 201,
+                 cache_size: int = 1024, context=None):
+        if engine_type not in self.ENGINE_TYPES:
+            raise ValueError(f"Unsupported engine type: {engine_type} (expected one of {self.ENGINE_TYPES})")
+        if engine_type == "binomial" and int(binomial_steps) < 2:
+            raise ValueError("binomial_steps must be at least 2")
         self.market = market
-        self.today = Date().todaysDate()
-        Settings.instance().evaluationDate = self.today
+        self.engine_type = engine_type
+        self.binomial_steps = int(binomial_steps)
+        # valuation date/day count: explicit, else the market's, else pinned to today
+        self.context = context or (market.context if market is not None else ValuationContext.today())
 
         self.spot_handle = (market.spot_handle if market is not None else QuoteHandle(SimpleQuote(float((spot)))))
 
-        day_count = Actual365Fixed()
+        day_count = self.context.day_count
         
         if market is not None:
             self.rate_curve = market.r_handle
@@ -39,205 +97,992 @@ class BlackScholesModel:
             self.rate_curve,
             self.vol_curve,
         )
+        # engines are shared by every cached option; the process observes the market handles
+        self._engines = {
+            "European": AnalyticEuropeanEngine(self.bs_process),
+            "American": self._american_engine(self.bs_process),
+        }
+        self._options = _OptionCache(cache_size)
 
-    
-    def price(self, instrument) -> float:
-        process = BlackScholesMertonProcess(
-            self.market.spot_handle,
-            self.market.q_handle,
-            self.market.r_handle,
-            self.market.vol_handle)
-        payoff = PlainVanillaPayoff(instrument.option_type, instrument.strike)
+    def _american_engine(self, process):
+        if self.engine_type == "binomial":
+            return BinomialVanillaEngine(process, "crr", self.binomial_steps)
+        return BaroneAdesiWhaleyApproximationEngine(process)
 
-        if getattr(instrument, "style", "European") == "American":
-            exercise = AmericanExercise(self.today, instrument.maturity)
-            engine = BaroneAdesiWhaleyApproximationEngine(self.bs_process)
- 
-        else:
-            exercise = EuropeanExercise(instrument.maturity)
-            engine = AnalyticEuropeanEngine(self.bs_process)
-        
-        ql_option = VanillaOption(payoff, exercise)
-        ql_option.setPricingEngine(engine)
+    def _option(self, instrument, style=None):
+        """Cached VanillaOption for the instrument (built once per strike/maturity/type/style)."""
+        style = style or getattr(instrument, "style", "European")
+
+        def build():
+            payoff = PlainVanillaPayoff(instrument.option_type, instrument.strike)
+            if style == "American":
+                exercise = AmericanExercise(self.today, instrument.maturity)
+            else:
+                exercise = EuropeanExercise(instrument.maturity)
+            ql_option = VanillaOption(payoff, exercise)
+            ql_option.setPricingEngine(self._engines[style])
+            return ql_option
+
+        return self._options.get(_instrument_key(instrument, style), build)
+
+    @property
+    def today(self) -> Date:
+        return self.context.date
 
-        return float(ql_option.NPV())
+    @property
+    def process(self):
+        return self.bs_process
+    
+    def price(self, instrument) -> float:
+        with self.context.activate():
+            return float(self._option(instrument).NPV())
         
     def greeks(self, instrument):
-        process = BlackScholesMertonProcess(self.market.spot_handle,
-                                            self.market.q_handle,
-                                            self.market.r_handle,
-                                            self.market.vol_handle)
-        engine = AnalyticEuropeanEngine(process)
-        payoff = PlainVanillaPayoff(instrument.option_type, instrument.strike)
-        exercise = EuropeanExercise(instrument.maturity)
-        ql_option = VanillaOption(payoff, exercise)
-        ql_option.setPricingEngine(engine)
+        if getattr(instrument, "style", "European") == "American":
+            values = self.greeks_arrays([instrument.strike], [instrument.maturity.serialNumber()],
+                                        [int(instrument.option_type)], style="American")
+            return {g: float(v[0]) for g, v in values.items()}
+        ql_option = self._option(instrument, style="European")
+
+        with self.context.activate():
+            return{
+                'delta': ql_option.delta(),
+                'gamma': ql_option.gamma(),
+                'vega': ql_option.vega(),
+                'theta': ql_option.theta(),
+
+                }
+
+    def _black_inputs(self, strike, maturity):
+        """Flat (T, r, q, vol) per contract reproducing the process curves at each maturity/strike.
+
+        Discounts and variances are read from the handles once per distinct maturity and
+        (maturity, strike), so the result can be priced in closed form with analytic.bs_greeks."""
+        dc = self.context.day_count
+        T, r, q, vol = (np.zeros(len(strike)) for _ in range(4))
+        for m in np.unique(maturity):
+            date = Date(int(m))
+            t = dc.yearFraction(self.today, date)
+            if t <= 0:
+                continue
+            idx = np.flatnonzero(maturity == m)
+            T[idx] = t
+            r[idx] = -math.log(self.rate_curve.discount(date)) / t
+            q[idx] = -math.log(self.div_curve.discount(date)) / t
+            for k in np.unique(strike[idx]):
+                vol[idx[strike[idx] == k]] = math.sqrt(self.vol_curve.blackVariance(date, float(k), True) / t)
+        return T, r, q, vol
+
+    def price_arrays(self, strike, maturity, option_type, style="European"):
+        """Prices for columns of contracts sharing one style (maturities as Date serial numbers).
+
+        Europeans are priced in one closed-form call; Americans go through the cached
+        per-contract options."""
+        strike, maturity, option_type = np.asarray(strike, dtype=float), np.asarray(maturity), np.asarray(option_type)
+        if style == "American":
+            return np.array([self.price(SimpleNamespace(strike=float(k), maturity=Date(int(m)), option_type=int(t), style=style))
+                             for k, m, t in zip(strike, maturity, option_type)])
+        T, r, q, vol = self._black_inputs(strike, maturity)
+        return np.where(T > 0, bs_price(self.spot_handle.value(), strike, T, option_type, r, q, vol), 0.0)
+
+    def greeks_arrays(self, strike, maturity, option_type, style="European"):
+        """Delta, gamma, vega and theta for columns of contracts sharing one style (as greeks()).
+
+        Europeans are closed form; Americans are bumped on the model's American engine
+        (see _american_greeks)."""
+        strike, maturity, option_type = np.asarray(strike, dtype=float), np.asarray(maturity), np.asarray(option_type)
+        T, r, q, vol = self._black_inputs(strike, maturity)
+        if style == "American":
+            return self._american_greeks(strike, maturity, option_type, T, r, q, vol)
+        out = bs_greeks(self.spot_handle.value(), strike, T, option_type, r, q, vol)
+        return {g: np.where(T > 0, out[g], 0.0) for g in ("delta", "gamma", "vega", "theta")}
+
+    def _american_greeks(self, strike, maturity, option_type, T, r, q, vol, bump=0.01, vol_bump=0.01):
+        """Bump-and-revalue greeks of American contracts on the model's American engine.
+
+        Each contract is priced on a flat process at its own (r, q, vol) from _black_inputs:
+        spot moved by +-bump (relative), vol by +-vol_bump, and the maturity pulled in one day
+        for theta (per year)."""
+        dc = self.context.day_count
+        S = self.spot_handle.value()
+        h = bump * S
+        out = {g: np.zeros(len(strike)) for g in ("delta", "gamma", "vega", "theta")}
+        with self.context.activate():
+            today = self.today
+            for i in np.flatnonzero(T > 0):
+                spot, sigma = SimpleQuote(S), SimpleQuote(vol[i])
+                process = BlackScholesMertonProcess(
+                    QuoteHandle(spot),
+                    YieldTermStructureHandle(FlatForward(today, q[i], dc)),
+                    YieldTermStructureHandle(FlatForward(today, r[i], dc)),
+                    BlackVolTermStructureHandle(BlackConstantVol(today, NullCalendar(), QuoteHandle(sigma), dc)),
+                )
+                engine = self._american_engine(process)
+                payoff = PlainVanillaPayoff(int(option_type[i]), float(strike[i]))
+                mat = Date(int(maturity[i]))
+                option = VanillaOption(payoff, AmericanExercise(today, mat))
+                option.setPricingEngine(engine)
+
+                def npv(quote, value):
+                    quote.setValue(value)
+                    return option.NPV()
+
+                mid = option.NPV()
+                up, dn = npv(spot, S + h), npv(spot, S - h)
+                spot.setValue(S)
+                v_up, v_dn = npv(sigma, vol[i] + vol_bump), npv(sigma, max(vol[i] - vol_bump, 1e-8))
+                sigma.setValue(vol[i])
+                out["delta"][i] = (up - dn) / (2.0 * h)
+                out["gamma"][i] = (up - 2.0 * mid + dn) / (h * h)
+                out["vega"][i] = (v_up - v_dn) / (vol[i] + vol_bump - max(vol[i] - vol_bump, 1e-8))
+                if mat - 1 > today:
+                    shorter = VanillaOption(payoff, AmericanExercise(today, mat - 1))
+                    shorter.setPricingEngine(engine)
+                    out["theta"][i] = (shorter.NPV() - mid) / dc.yearFraction(mat - 1, mat)
+        return out
+
+
+def _moments(values):
+    """Return (mean, M2) of an array, M2 being the sum of squared deviations.
+
+    For a (k, n) array of k variables, mean is a k-vector and M2 the k x k co-moment matrix."""
+    if values.ndim == 1:
+        mean = float(values.sum()) / values.size
+        dev = values - mean
+        return mean, float(dev @ dev)
+    mean = values.sum(axis=1) / values.shape[1]
+    dev = values - mean[:, None]
+    return mean, dev @ dev.T
+
+
+class _RunningStats:
+    """Streaming mean/M2 accumulator: block moments are folded in with the pairwise (Chan) update."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
 
-        return{
-            'delta': ql_option.delta(),
-            'gamma': ql_option.gamma(),
-            'vega': ql_option.vega(),
-            'theta': ql_option.theta(),
+    def add(self, values):
+        if values.size:
+            self.merge(values.shape[-1], *_moments(values))
 
-            }
+    def merge(self, n_b, mean_b, m2_b):
+        if self.n == 0:
+            self.n, self.mean, self.m2 = n_b, mean_b, m2_b
+            return
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + np.multiply.outer(delta, delta) * (self.n * n_b / n)
+        self.n = n
+
+    @property
+    def variance(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+
+class _DrawCache:
+    """LRU of read-only draw arrays bounded by their total size in bytes (max_bytes=None: unbounded)."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._draws = OrderedDict()  # key -> (draws, nbytes)
+
+    def get(self, key):
+        entry = self._draws.get(key)
+        if entry is None:
+            return None
+        self._draws.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, draws):
+        size = sum(Zs.nbytes for Zs in draws) if isinstance(draws, tuple) else draws.nbytes
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._draws[key] = (draws, size)
+        self.nbytes += size
+        while self.max_bytes is not None and self.nbytes > self.max_bytes:
+            self.nbytes -= self._draws.popitem(last=False)[1][1]
+
+    def __len__(self):
+        return len(self._draws)
+
+    def __iter__(self):
+        return iter(self._draws)
+
+
+def _mc_block(model, T, strike, option_type, num_paths, seed_seq, antithetic, controls=()):
+    """Simulate one independent block of paths in a worker process; returns (n, mean, M2)."""
+    rng = np.random.default_rng(seed_seq)
+    Zs = model._normals(rng, num_paths, antithetic)
+    return (num_paths,) + _moments(model._block_values(Zs, T, strike, option_type, controls))
 
 
 class MonteCarloModel:
-    def __init__(self, spot, risk_free_rate, volatility, div_yield=0.0, num_paths=10000):
+    parallel_block_size = 1 << 16
+
+    def __init__(self, spot, risk_free_rate, volatility, div_yield=0.0, num_paths=10000, draw_cache_bytes=64 << 20,
+                 exercise_steps=50, lsm_basis="laguerre", lsm_degree=3, context=None):
         self.spot = spot
+        # maturities are measured from context.date (by default the evaluation date at construction)
+        self.context = context or ValuationContext.today()
         self.r = risk_free_rate
         self.q = div_yield
         self.vol = volatility
-    
+        # Longstaff–Schwartz defaults for American-style options
+        self.exercise_steps = exercise_steps
+        self.lsm_basis = lsm_basis
+        self.lsm_degree = lsm_degree
+        # LRU cache of seeded draws keyed by (seed, num_paths, antithetic, sampler, replications),
+        # holding at most draw_cache_bytes of arrays (0 disables it)
+        self.draw_cache_bytes = draw_cache_bytes
+        self._draw_cache = _DrawCache(draw_cache_bytes)
 
-    def price(self, instrument, num_paths, seed=None, antithetic=False, control_variate=False):
-        
-        T = Actual365Fixed().yearFraction(Settings.instance().evaluationDate, instrument.maturity)
-        if T <= 0:
-            return 0.0
-        N = num_paths
+    def __getstate__(self):
+        # don't ship cached draws to worker processes
+        state = dict(self.__dict__)
+        state["_draw_cache"] = _DrawCache(self.draw_cache_bytes)
+        return state
+
+    def _bumped(self, **changes):
+        """Copy of the model with e.g. spot/vol replaced, sharing this model's draw cache."""
+        model = type(self).__new__(type(self))
+        model.__dict__.update(self.__dict__)
+        model.__dict__.update(changes)
+        return model
+
+    def _crn(self, seed):
+        """(model, seed) for a bump-and-revalue set, so every revaluation runs on common random numbers.
+
+        Seeded sets use this model and its shared draw cache. Unseeded ones get a fresh seed
+        and a copy of the model with a private cache, so their one-off draws are reused across
+        the bumps without evicting the shared entries."""
+        if seed is not None:
+            return self, seed
+        return self._bumped(_draw_cache=_DrawCache(None)), int(np.random.SeedSequence().generate_state(1)[0])
+
+    def _draws(self, num_paths, seed, antithetic, sampler="pseudo", replications=None):
+        """Unchunked draws for a run; seeded draws are served from (and stored in) the LRU draw cache.
+
+        For sampler="sobol" this is a tuple with one array per replication."""
+        cacheable = isinstance(seed, (int, np.integer))
+        key = (int(seed) if cacheable else None, num_paths, antithetic, sampler, replications)
+        if cacheable:
+            cached = self._draw_cache.get(key)
+            if cached is not None:
+                return cached
+
+        if sampler == "sobol":
+            draws = tuple(np.concatenate(list(sobol_normal_blocks(num_paths // replications, 1, stream, antithetic)))
+                          for stream in np.random.SeedSequence(seed).spawn(replications))
+        else:
+            rng = np.random.default_rng(seed) if seed is not None else np.random.default_rng()
+            draws = self._normals(rng, num_paths, antithetic)
+        if cacheable:
+            for Zs in (draws if sampler == "sobol" else (draws,)):
+                Zs.flags.writeable = False
+            self._draw_cache.put(key, draws)
+        return draws
+
+    def _year_fraction(self, instrument) -> float:
+        return self.context.year_fraction(instrument.maturity)
+
+    @staticmethod
+    def _normals(rng, num_paths, antithetic=False):
+        """Draw N standard normals; antithetic pairs are laid out as [Z, -Z] with the odd path last."""
+        if antithetic:
+            half = rng.standard_normal(num_paths // 2)
+            Zs = np.concatenate([half, -half])
+        else:
+            Zs = rng.standard_normal(num_paths)
+        if Zs.size < num_paths:  # if N is odd, add one extra draw
+            Zs = np.concatenate([Zs, rng.standard_normal(1)])
+        return Zs
+
+    def _terminal_spots(self, Zs, T):
+        """One-step GBM terminal values S0 * exp(mu + sig * Z), computed in place on a copy of Zs."""
         r = float(self.r); q = float(self.q); vol = float(self.vol)
-        S0 = float(self.spot)
-        K = float(instrument.strike)
-        disc = math.exp(-r * T)
-        mu = (r - q - 0.5 * (vol**2)) * T
+        mu = (r - q - 0.5 * vol * vol) * T
         sig = vol * math.sqrt(T)
-        rng = np.random.default_rng(seed) if seed is not None else np.random.default_rng()
+        ST = np.multiply(Zs, sig)
+        ST += mu
+        np.exp(ST, out=ST)
+        ST *= float(self.spot)
+        return ST
+
+    @staticmethod
+    def _payoffs(ST, strike, option_type, out=None):
+        """Vanilla payoff max(ST - K, 0) / max(K - ST, 0) over an array of terminal spots."""
+        K = float(strike)
+        if option_type == QLOption.Call:
+            payoffs = np.subtract(ST, K, out=out)
+        else:
+            payoffs = np.subtract(K, ST, out=out)
+        return np.maximum(payoffs, 0.0, out=payoffs)
+
+    @staticmethod
+    def _normal_blocks(rng, num_paths, antithetic, chunk_size):
+        """Yield the draws of _normals in blocks of at most chunk_size, consuming the RNG in the same order."""
         if antithetic:
-            half = N // 2
-            Zs = rng.standard_normal(half)
-            Zs = np.concatenate([Zs, -Zs])
+            half, step = num_paths // 2, max(chunk_size // 2, 1)
+            for start in range(0, half, step):
+                Z = rng.standard_normal(min(step, half - start))
+                yield np.concatenate([Z, -Z])
+            if 2 * half < num_paths:
+                yield rng.standard_normal(1)
+        else:
+            for start in range(0, num_paths, chunk_size):
+                yield rng.standard_normal(min(chunk_size, num_paths - start))
 
-        if not antithetic: Zs = rng.standard_normal(N)
+    @staticmethod
+    def _controls(control_variate):
+        """Normalise control_variate to a tuple of control names ("spot", "bs")."""
+        if not control_variate:
+            return ()
+        if control_variate is True:
+            return ("spot",)
+        controls = (control_variate,) if isinstance(control_variate, str) else tuple(control_variate)
+        for c in controls:
+            if c not in {"spot", "bs"}:
+                raise ValueError(f"Unsupported control variate: {c}")
+        return controls
 
-        if Zs.size < N:  # if N is odd, add one extra draw
-            Zs = np.concatenate([Zs, rng.standard_normal(1)])
-    
-        payoffs = []
-        for Z in Zs:
-            ST = S0 * math.exp(mu + sig * float(Z))
-            if instrument.option_type == QLOption.Call:
-                payoff = max(ST - K, 0.0)
-            else:
-                payoff = max(K - ST, 0.0)
-            payoffs.append(payoff)
-        price = disc * (sum(payoffs) / N)
-        return price
+    def _block_values(self, Zs, T, strike, option_type, controls=()):
+        """Payoffs for a block of draws, stacked on top of the control samples when controls are used."""
+        ST = self._terminal_spots(Zs, T)
+        if not controls:
+            return self._payoffs(ST, strike, option_type, out=ST)
+        payoffs = self._payoffs(ST, strike, option_type)
+        # the "bs" control is the vanilla payoff itself, with the analytic price as its known mean
+        return np.vstack([payoffs] + [ST if c == "spot" else payoffs for c in controls])
+
+    def _control_means(self, T, strike, option_type, controls):
+        """Known (undiscounted) expectations of the controls: E[S_T] and the analytic vanilla price."""
+        r = float(self.r); q = float(self.q); S0 = float(self.spot)
+        return np.array([S0 * math.exp((r - q) * T) if c == "spot"
+                         else float(bs_price(S0, float(strike), T, option_type, r, q, float(self.vol))) * math.exp(r * T)
+                         for c in controls])
+
+    def _estimate(self, stats, T, control_means=None):
+        """Discounted (price, se) from accumulated stats, applying the regression control-variate
+        adjustment (beta estimated from the same paths) when control means are given."""
+        disc = math.exp(-float(self.r) * T)
+        if control_means is None or not len(control_means):
+            return disc * stats.mean, disc * math.sqrt(stats.variance / stats.n)
+        k = len(control_means)
+        C = stats.m2
+        beta = np.linalg.lstsq(C[1:, 1:], C[1:, 0], rcond=None)[0]
+        mean = stats.mean[0] - beta @ (stats.mean[1:] - control_means)
+        resid = max(C[0, 0] - beta @ C[1:, 0], 0.0)
+        var = resid / (stats.n - 1 - k) if stats.n > 1 + k else 0.0
+        return disc * float(mean), disc * math.sqrt(var / stats.n)
+
+    def price(self, instrument, num_paths, seed=None, antithetic=False, control_variate=False, **kwargs):
+        return self.price_and_se(instrument, num_paths, seed=seed, antithetic=antithetic,
+                                 control_variate=control_variate, **kwargs)[0]
     
-    def price_and_se(self, instrument, num_paths, seed=None, antithetic=False, control_variate=False):
-        '''return (price, standard_error) for a european option via one-step MC.'''
-        T = Actual365Fixed().yearFraction(Settings.instance().evaluationDate, instrument.maturity)
+    def price_and_se(self, instrument, num_paths, seed=None, antithetic=False, control_variate=False, chunk_size=None,
+                     workers=None, sampler="pseudo", replications=16):
+        '''return (price, standard_error) for a european option via one-step MC.
+
+        Path-dependent instruments (those with fixing_dates/path_payoff) are simulated on
+        their fixing grid by GBMPathGenerator, streaming one time step at a time, and
+        American-style options go to price_american (Longstaff–Schwartz); chunk_size,
+        workers and sobol apply to single-step pricing only.
+
+        With chunk_size set, draws are generated and folded into running sums block by
+        block, so peak memory is O(chunk_size) and the answer does not depend on it.
+
+        With workers set, the paths are split into fixed blocks (chunk_size, default
+        parallel_block_size), each with its own stream spawned from SeedSequence(seed),
+        and run on a process pool. Blocks are merged in order, so the result depends on
+        seed and block size but not on the number of workers.
+
+        control_variate may be True/"spot" (discounted terminal spot, mean S0*exp(-qT)),
+        "bs" (the analytic Black–Scholes price of the same contract) or a tuple of both;
+        the regression coefficient is estimated from the same paths and the SE is that
+        of the adjusted estimator.
+
+        sampler="sobol" uses scrambled Sobol points through the inverse normal. The
+        paths are split over `replications` independent scramblings; the price is their
+        average and the SE comes from their spread (the i.i.d. formula does not apply to QMC).'''
+        T = self._year_fraction(instrument)
         if T <= 0:
             return 0.0, 0.0
         N = num_paths
-        S0 = float(self.spot)
-        # Use NumPy RNG so seeding is effective; build Z draws (with optional antithetic pairing)
+        controls = self._controls(control_variate)
+        if hasattr(instrument, "path_payoff"):
+            if chunk_size is not None or workers is not None:
+                raise ValueError("chunk_size/workers are not supported for path-dependent instruments")
+            return self._path_price_and_se(instrument, T, N, seed, antithetic, controls, sampler, replications)
+        if getattr(instrument, "style", "European") == "American":
+            if chunk_size is not None or workers is not None or sampler != "pseudo":
+                raise ValueError("American options support pseudo-random, unchunked, single-process pricing only")
+            return self.price_american([instrument], N, seed=seed, antithetic=antithetic,
+                                       control_variate=control_variate)[0]
+        if sampler == "sobol":
+            if workers is not None:
+                raise ValueError("workers is not supported with sampler='sobol'")
+            return self._sobol_price_and_se(instrument, T, N, seed, antithetic, chunk_size, controls, replications)
+        if sampler != "pseudo":
+            raise ValueError(f"Unsupported sampler: {sampler}")
+        if workers is not None:
+            stats = self._parallel_stats(instrument, T, N, seed, antithetic,
+                                         chunk_size or self.parallel_block_size, workers, controls)
+        else:
+            # Use NumPy RNG so seeding is effective; build Z draws (with optional antithetic pairing)
+            if chunk_size is None:
+                blocks = (self._draws(N, seed, antithetic),)
+            else:
+                rng = np.random.default_rng(seed) if seed is not None else np.random.default_rng()
+                blocks = self._normal_blocks(rng, N, antithetic, int(chunk_size))
+
+            stats = _RunningStats()
+            for Zs in blocks:
+                stats.add(self._block_values(Zs, T, instrument.strike, instrument.option_type, controls))
+        return self._estimate(stats, T, self._control_means(T, instrument.strike, instrument.option_type, controls))
+
+    def price_to_target(self, instrument, target_se=None, target_rel_se=None, max_paths=10_000_000,
+                        batch_size=50_000, seed=None, antithetic=False, control_variate=False):
+        '''Simulate in batches until the running SE meets the target; returns (price, se, paths_used).
+
+        target_se is an absolute SE, target_rel_se is relative to |price|; the run stops at
+        whichever is hit first, or at max_paths. The first n paths are the same draws
+        price_and_se(num_paths=n, chunk_size=batch_size) would use.'''
+        if target_se is None and target_rel_se is None:
+            raise ValueError("Provide target_se and/or target_rel_se")
+        T = self._year_fraction(instrument)
+        if T <= 0:
+            return 0.0, 0.0, 0
+        controls = self._controls(control_variate)
+        control_means = self._control_means(T, instrument.strike, instrument.option_type, controls)
         rng = np.random.default_rng(seed) if seed is not None else np.random.default_rng()
-        if antithetic:
-            half = N // 2
-            Zs = rng.standard_normal(half)
-            Zs = np.concatenate([Zs, -Zs])
 
-        if not antithetic: Zs = rng.standard_normal(N)
+        stats = _RunningStats()
+        price = se = 0.0
+        for Zs in self._normal_blocks(rng, int(max_paths), antithetic, int(batch_size)):
+            stats.add(self._block_values(Zs, T, instrument.strike, instrument.option_type, controls))
+            price, se = self._estimate(stats, T, control_means)
+            if stats.n < 2:
+                continue
+            if target_se is not None and se <= target_se:
+                break
+            if target_rel_se is not None and se <= target_rel_se * abs(price):
+                break
+        return price, se, stats.n
 
-        if Zs.size < N:  # if N is odd, add one extra draw
-            Zs = np.concatenate([Zs, rng.standard_normal(1)])
-        
-        r = float(self.r); q = float(self.q); vol = float(self.vol)
-        S0 = float(self.spot); K = float(instrument.strike)
-        disc = math.exp(-r * T)
-        mu = (r - q - 0.5 * vol * vol) * T
-        sig = vol * math.sqrt(T)
-        payoffs = []
+    def _sobol_price_and_se(self, instrument, T, num_paths, seed, antithetic, chunk_size, controls, replications):
+        """Randomised QMC: average of independently scrambled Sobol runs, SE from their spread."""
+        if replications < 2 or num_paths < replications:
+            raise ValueError("sampler='sobol' needs replications >= 2 and num_paths >= replications")
+        control_means = self._control_means(T, instrument.strike, instrument.option_type, controls)
+        if chunk_size is None:
+            replicated = [(Zs,) for Zs in self._draws(num_paths, seed, antithetic, "sobol", replications)]
+        else:
+            replicated = [sobol_normal_blocks(num_paths // replications, 1, stream, antithetic, chunk_size)
+                          for stream in np.random.SeedSequence(seed).spawn(replications)]
+        estimates = []
+        for blocks in replicated:
+            stats = _RunningStats()
+            for Zs in blocks:
+                stats.add(self._block_values(Zs, T, instrument.strike, instrument.option_type, controls))
+            estimates.append(self._estimate(stats, T, control_means)[0])
+        estimates = np.array(estimates)
+        return float(estimates.mean()), float(estimates.std(ddof=1) / math.sqrt(replications))
 
-        for Z in Zs:
-            ST = S0 * math.exp(mu + sig * Z)
-            if instrument.option_type == QLOption.Call:
-                payoff = max(ST - K, 0.0)
-            else:
-                payoff = max(K - ST, 0.0)
-            payoffs.append(payoff)
-        mean_payoff = sum(payoffs) / N
-        var_payoff = (sum((x - mean_payoff)**2 for x in payoffs) / (N-1)) if N > 1 else 0.0
-        price = disc * mean_payoff
-        se = disc * math.sqrt(var_payoff / N)
-        return price, se
-    
-    def delta(self, instrument, num_paths, bump=0.01, seed=None, antithetic=True, **kwargs):
-        '''Finite-difference Delta: (P(S0+bump) - P(S0-bump)) / (2*bump).'''
+    def _path_times(self, instrument, T):
+        """Simulation grid (fixing times plus maturity) and a mask of which steps are fixings."""
+        fixing_times = [self.context.year_fraction(d) for d in instrument.fixing_dates]
+        if fixing_times[0] <= 0:
+            raise ValueError("Fixing dates must fall after the evaluation date")
+        times = sorted(set(fixing_times) | {T})
+        fixings = set(fixing_times)
+        return np.array(times), [t in fixings for t in times]
+
+    def _path_values(self, instrument, steps, is_fixing, num_paths, controls=()):
+        """Path payoffs accumulated from streamed steps, stacked on top of the control samples."""
+        payoff = instrument.path_payoff()
+        state = payoff.start(num_paths)
+        for S_t, fixing in zip(steps, is_fixing):
+            if fixing:
+                payoff.update(state, S_t)
+        values = payoff.finish(state, S_t)
+        if not controls:
+            return values
+        return np.vstack([values] + [S_t if c == "spot" else self._payoffs(S_t, instrument.strike, instrument.option_type)
+                                     for c in controls])
+
+    def _path_price_and_se(self, instrument, T, num_paths, seed, antithetic, controls, sampler, replications):
+        """Multi-step pricing on the fixing grid; the "bs" control is the vanilla european on S_T."""
+        if "bs" in controls and instrument.strike is None:
+            raise ValueError("The 'bs' control variate needs a strike")
+        control_means = self._control_means(T, instrument.strike, instrument.option_type, controls)
+        generator = GBMPathGenerator(self.spot, self.r, self.vol, self.q)
+        times, is_fixing = self._path_times(instrument, T)
+        if sampler == "sobol":
+            if replications < 2 or num_paths < replications:
+                raise ValueError("sampler='sobol' needs replications >= 2 and num_paths >= replications")
+            n_rep = num_paths // replications
+            estimates = []
+            for stream in np.random.SeedSequence(seed).spawn(replications):
+                stats = _RunningStats()
+                steps = generator.iter_steps(times, n_rep, stream, antithetic, sampler="sobol")
+                stats.add(self._path_values(instrument, steps, is_fixing, n_rep, controls))
+                estimates.append(self._estimate(stats, T, control_means)[0])
+            estimates = np.array(estimates)
+            return float(estimates.mean()), float(estimates.std(ddof=1) / math.sqrt(replications))
+        if sampler != "pseudo":
+            raise ValueError(f"Unsupported sampler: {sampler}")
+        stats = _RunningStats()
+        steps = generator.iter_steps(times, num_paths, seed, antithetic)
+        stats.add(self._path_values(instrument, steps, is_fixing, num_paths, controls))
+        return self._estimate(stats, T, control_means)
+
+    @staticmethod
+    def _lsm_basis(x, basis, degree):
+        """Regression basis (n x degree+1) in x = S/S0: monomials or Laguerre polynomials."""
+        if basis == "monomial":
+            return np.vander(x, degree + 1, increasing=True)
+        if basis != "laguerre":
+            raise ValueError(f"Unsupported basis: {basis}")
+        L = [np.ones_like(x), 1.0 - x]
+        for n in range(1, degree):
+            L.append(((2 * n + 1 - x) * L[n] - n * L[n - 1]) / (n + 1))
+        return np.column_stack(L[:degree + 1])
+
+    def price_american(self, instruments, num_paths, seed=None, antithetic=False, control_variate=False,
+                       exercise_steps=None, basis=None, degree=None):
+        '''Longstaff–Schwartz prices for a list of American options; returns [(price, se), ...] in input order.
+
+        Options sharing a maturity are priced off one set of paths, exercisable on an evenly
+        spaced grid of exercise_steps dates. At each date the continuation value of every
+        strike is regressed on the basis ("laguerre"/"monomial" of the given degree, in S/S0)
+        over its in-the-money paths, all strikes in one batched least-squares solve.
+        Defaults come from the model's exercise_steps/lsm_basis/lsm_degree.'''
+        exercise_steps = exercise_steps or self.exercise_steps
+        basis = basis or self.lsm_basis
+        degree = degree or self.lsm_degree
+        controls = self._controls(control_variate)
+        r = float(self.r); S0 = float(self.spot)
+
+        results = [(0.0, 0.0)] * len(instruments)
+        by_maturity = {}
+        for i, inst in enumerate(instruments):
+            T = self._year_fraction(inst)
+            if T > 0:
+                by_maturity.setdefault(T, []).append(i)
+        generator = GBMPathGenerator(self.spot, self.r, self.vol, self.q)
+
+        for T, idx in by_maturity.items():
+            times = T * np.arange(1, exercise_steps + 1) / exercise_steps
+            paths = generator.paths(times, num_paths, seed, antithetic)
+            step_disc = math.exp(-r * T / exercise_steps)
+            K = np.array([[float(instruments[i].strike)] for i in idx])
+            w = np.array([[1.0 if instruments[i].option_type == QLOption.Call else -1.0] for i in idx])
+
+            # backward induction; V holds each path's cashflow discounted to the current date
+            V = np.maximum(w * (paths[-1] - K), 0.0)
+            for k in range(exercise_steps - 2, -1, -1):
+                V *= step_disc
+                exercise = np.maximum(w * (paths[k] - K), 0.0)
+                itm = (exercise > 0).astype(float)
+                phi = self._lsm_basis(paths[k] / S0, basis, degree)
+                A = np.einsum("sn,nj,nk->sjk", itm, phi, phi)
+                b = np.einsum("sn,nj->sj", itm * V, phi)
+                coef = (np.linalg.pinv(A) @ b[:, :, None])[:, :, 0]
+                stop = (itm > 0) & (exercise > coef @ phi.T)
+                V = np.where(stop, exercise, V)
+            V *= step_disc * math.exp(r * T)  # undiscounted-to-T convention used by _estimate
+
+            for j, i in enumerate(idx):
+                inst = instruments[i]
+                values = V[j]
+                if controls:
+                    values = np.vstack([values] + [paths[-1] if c == "spot" else
+                                                   self._payoffs(paths[-1], inst.strike, inst.option_type)
+                                                   for c in controls])
+                stats = _RunningStats()
+                stats.add(values)
+                price, se = self._estimate(stats, T, self._control_means(T, inst.strike, inst.option_type, controls))
+                results[i] = (max(price, float(np.maximum(w[j, 0] * (S0 - K[j, 0]), 0.0))), se)
+        return results
+
+    def greeks_american(self, instruments, num_paths, seed=None, antithetic=False, bump=None, vol_bump=0.01, **kwargs):
+        '''Price, delta, gamma and vega arrays for a list of American options from batched LSM revaluations.
+
+        Each of spot, spot +- bump (default 1% of spot) and vol +- vol_bump is one price_american
+        call over all the options, on common random numbers (see _crn). kwargs go to
+        price_american.'''
+        model, seed = self._crn(seed)
+        S0, vol = float(self.spot), float(self.vol)
+        b = 0.01 * S0 if bump is None else float(bump)
+
+        def prices(**changes):
+            return np.array([p for p, _ in model._bumped(**changes).price_american(
+                instruments, num_paths, seed=seed, antithetic=antithetic, **kwargs)])
+
+        mid, up, dn = prices(), prices(spot=S0 + b), prices(spot=S0 - b)
+        vol_up, vol_dn = prices(vol=vol + vol_bump), prices(vol=vol - vol_bump)
+        return {"price": mid, "delta": (up - dn) / (2.0 * b), "gamma": (up - 2.0 * mid + dn) / (b * b),
+                "vega": (vol_up - vol_dn) / (2.0 * vol_bump)}
+
+    def _parallel_stats(self, instrument, T, num_paths, seed, antithetic, block_size, workers, controls=()):
+        sizes = [min(block_size, num_paths - start) for start in range(0, num_paths, block_size)]
+        streams = np.random.SeedSequence(seed).spawn(len(sizes))
+        args = ([self] * len(sizes), [T] * len(sizes), [float(instrument.strike)] * len(sizes),
+                [instrument.option_type] * len(sizes), sizes, streams, [antithetic] * len(sizes),
+                [controls] * len(sizes))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(_mc_block, *args, chunksize=max(1, len(sizes) // (4 * workers))))
+        else:
+            parts = list(map(_mc_block, *args))
+        stats = _RunningStats()
+        for part in parts:
+            stats.merge(*part)
+        return stats
+
+    def price_batch(self, instruments, num_paths, seed=None, antithetic=False):
+        '''Price a list of european options off one set of draws; returns [(price, se), ...] in input order.
+
+        Terminal spots are simulated once per distinct maturity and every payoff is
+        read off the same paths, so errors across strikes are correlated.'''
+        if any(hasattr(inst, "path_payoff") for inst in instruments):
+            raise ValueError("price_batch prices vanilla options only; use price_and_se for path-dependent options")
+        if any(getattr(inst, "style", "European") == "American" for inst in instruments):
+            raise ValueError("price_batch prices European options only; use price_american for American options")
+        results = [(0.0, 0.0)] * len(instruments)
+        by_maturity = {}
+        for i, inst in enumerate(instruments):
+            T = self._year_fraction(inst)
+            if T > 0:
+                by_maturity.setdefault(T, []).append(i)
+        if not by_maturity:
+            return results
+
+        N = num_paths
+        Zs = self._draws(N, seed, antithetic)
+        buf = np.empty(N)
+        for T, idx in by_maturity.items():
+            ST = self._terminal_spots(Zs, T)
+            disc = math.exp(-float(self.r) * T)
+            for i in idx:
+                payoffs = self._payoffs(ST, instruments[i].strike, instruments[i].option_type, out=buf)
+                mean_payoff, m2 = _moments(payoffs)
+                var_payoff = m2 / (N - 1) if N > 1 else 0.0
+                results[i] = (disc * mean_payoff, disc * math.sqrt(var_payoff / N))
+        return results
+
+    _GREEKS = ("price", "delta", "gamma", "vega", "rho", "theta")
+
+    def _greek_samples(self, Zs, T, strike, option_type):
+        """Per-path (undiscounted) estimators of price, delta, gamma, vega, rho and theta.
+
+        Delta, vega, rho and theta are pathwise derivatives of the payoff; gamma uses the
+        mixed likelihood-ratio/pathwise estimator K * Z / (S0^2 sig sqrt(T)) on the ITM set."""
+        r = float(self.r); q = float(self.q); vol = float(self.vol); S0 = float(self.spot)
+        K = float(strike)
+        sqrtT = math.sqrt(T)
+        ST = self._terminal_spots(Zs, T)
+        w = 1.0 if option_type == QLOption.Call else -1.0
+        itm = (ST > K) if w > 0 else (ST < K)
+        payoffs = self._payoffs(ST, K, option_type)
+        wI = np.where(itm, w, 0.0)
+        dS_dT = ST * ((r - q - 0.5 * vol * vol) + 0.5 * vol * Zs / sqrtT)
+        return np.vstack([
+            payoffs,
+            wI * ST / S0,
+            wI * K * Zs / (S0 * S0 * vol * sqrtT),
+            wI * ST * (sqrtT * Zs - vol * T),
+            T * (wI * ST - payoffs),
+            r * payoffs - wI * dS_dT,
+        ])
+
+    def greeks(self, instrument, num_paths, seed=None, antithetic=False, chunk_size=None):
+        '''Price, delta, gamma, vega, rho and theta from one simulation, each with its own SE.
+
+        Returns a dict in the units of BlackScholesModel.greeks (vega/rho per 1.00, theta
+        per year) plus "<name>_se" entries. Nothing on the model is mutated.'''
+        if hasattr(instrument, "path_payoff"):
+            raise ValueError("greeks are vanilla terminal-payoff estimators; path-dependent options are not supported")
+        if getattr(instrument, "style", "European") == "American":
+            raise ValueError("greeks are pathwise European estimators; use greeks_american for American options")
+        T = self._year_fraction(instrument)
+        if T <= 0:
+            return {**{g: 0.0 for g in self._GREEKS}, **{f"{g}_se": 0.0 for g in self._GREEKS}}
+        if chunk_size is None:
+            blocks = (self._draws(num_paths, seed, antithetic),)
+        else:
+            rng = np.random.default_rng(seed) if seed is not None else np.random.default_rng()
+            blocks = self._normal_blocks(rng, num_paths, antithetic, int(chunk_size))
+
+        stats = _RunningStats()
+        for Zs in blocks:
+            stats.add(self._greek_samples(Zs, T, instrument.strike, instrument.option_type))
+        disc = math.exp(-float(self.r) * T)
+        se = disc * np.sqrt(np.diag(stats.variance) / stats.n)
+        result = {g: disc * float(m) for g, m in zip(self._GREEKS, stats.mean)}
+        result.update({f"{g}_se": float(s) for g, s in zip(self._GREEKS, se)})
+        return result
+
+    def delta(self, instrument, num_paths, bump=0.01, seed=None, antithetic=True, sampler="pseudo", **kwargs):
+        '''Finite-difference Delta: (P(S0+bump) - P(S0-bump)) / (2*bump).
+
+        Both revaluations share one cached draw array; with seed=None a fresh seed is
+        drawn once (see _crn) so the bumps still run on common random numbers.'''
         S0_orig = float(self.spot)
         b = 0.01 * S0_orig if (bump is None) else float(bump)
-        try:
-            self.spot = S0_orig + b
-            up_price, _ = self.price_and_se(instrument, num_paths=num_paths, seed=seed, antithetic=antithetic)
-            self.spot = S0_orig - b
-            dn_price, _= self.price_and_se(instrument, num_paths=num_paths, seed=seed, antithetic=antithetic)
-        finally:
-            self.spot = S0_orig
+        model, seed = self._crn(seed)
+        up_price, _ = model._bumped(spot=S0_orig + b).price_and_se(instrument, num_paths=num_paths, seed=seed,
+                                                                   antithetic=antithetic, sampler=sampler)
+        dn_price, _ = model._bumped(spot=S0_orig - b).price_and_se(instrument, num_paths=num_paths, seed=seed,
+                                                                   antithetic=antithetic, sampler=sampler)
         return (up_price - dn_price ) / (2.0 * b)
     
-    def gamma(self, instrument, num_paths, bump=0.01, seed=None, antithetic=True, **kwargs):
-        """Central-difference gamma: (P(S0+b) - 2*P(S0) + P(S0-b)) / b**2."""
+    def gamma(self, instrument, num_paths, bump=0.01, seed=None, antithetic=True, sampler="pseudo", **kwargs):
+        """Central-difference gamma: (P(S0+b) - 2*P(S0) + P(S0-b)) / b**2, on common random numbers."""
         S0_orig = float(self.spot)
         b = 0.01 * S0_orig if (bump is None) else float(bump)
-        S0_up = S0_orig + b; S0_dn = S0_orig - b
-        try:
-            self.spot = S0_up
-            up_price, _ = self.price_and_se(instrument, num_paths=num_paths, seed=seed, antithetic=antithetic)
-            self.spot = S0_orig
-            mid_price, _ = self.price_and_se(instrument, num_paths=num_paths, seed=seed, antithetic=antithetic)
-            self.spot = S0_dn
-            dn_price, _ = self.price_and_se(instrument, num_paths=num_paths, seed=seed, antithetic=antithetic)
-        finally:
-            self.spot = S0_orig
+        model, seed = self._crn(seed)
+        up_price, mid_price, dn_price = (
+            model._bumped(spot=S0).price_and_se(instrument, num_paths=num_paths, seed=seed,
+                                                antithetic=antithetic, sampler=sampler)[0]
+            for S0 in (S0_orig + b, S0_orig, S0_orig - b))
 
         return (up_price - 2.0 * mid_price + dn_price) / (b * b)
 
-    def vega(self, instrument, num_paths, vol_bump=0.01, seed=None, antithetic=True, **kwargs):
-        """Central-difference vega: (P(σ+dv) - P(σ-dv)) / (2*dv)."""
+    def vega(self, instrument, num_paths, vol_bump=0.01, seed=None, antithetic=True, sampler="pseudo", **kwargs):
+        """Central-difference vega: (P(σ+dv) - P(σ-dv)) / (2*dv), on common random numbers."""
         vol_orig = float(self.vol)
-        try:
-            self.vol = vol_orig + vol_bump
-            up_price, _ = self.price_and_se(instrument, num_paths=num_paths, seed=seed, antithetic=antithetic)
-
-            self.vol = vol_orig - vol_bump
-            dn_price, _ = self.price_and_se(instrument, num_paths=num_paths, seed=seed, antithetic=antithetic)
-        finally:
-            self.vol = vol_orig
+        model, seed = self._crn(seed)
+        up_price, _ = model._bumped(vol=vol_orig + vol_bump).price_and_se(instrument, num_paths=num_paths, seed=seed,
+                                                                          antithetic=antithetic, sampler=sampler)
+        dn_price, _ = model._bumped(vol=vol_orig - vol_bump).price_and_se(instrument, num_paths=num_paths, seed=seed,
+                                                                          antithetic=antithetic, sampler=sampler)
 
         return (up_price - dn_price) / (2.0 * vol_bump)
         
             
+class SpotProfile:
+    """The solution of one finite-difference solve across the spot grid.
+
+    Values and greeks are interpolated at any spot inside the grid (spots), so ladders and
+    spot shifts of one contract cost a single solve. Greeks follow FdBlackScholesVanillaEngine:
+    delta and gamma per unit spot, theta per year."""
+
+    def __init__(self, solver, x):
+        self._solver = solver
+        self._x = x
+        self.spots = None if x is None else np.exp(x)
+
+    @classmethod
+    def expired(cls) -> "SpotProfile":
+        """Profile of an expired option: zero value and greeks at every spot, as the engine's NPV."""
+        return cls(None, None)
+
+    def covers(self, spots) -> bool:
+        """True when every spot lies strictly inside the grid."""
+        if self._solver is None:
+            return True
+        spots = np.asarray(spots, dtype=float)
+        return bool(np.all((spots > self.spots[1]) & (spots < self.spots[-2])))
+
+    def _eval(self, f, spots):
+        spots = np.asarray(spots, dtype=float)
+        if self._solver is None:
+            return np.zeros(spots.shape)
+        return np.array([f(math.log(s), s) for s in spots.ravel()]).reshape(spots.shape)
+
+    def value(self, spots):
+        return self._eval(lambda x, s: self._solver.interpolateAt(x), spots)
+
+    def delta(self, spots):
+        return self._eval(lambda x, s: self._solver.derivativeX(x) / s, spots)
+
+    def gamma(self, spots):
+        return self._eval(lambda x, s: (self._solver.derivativeXX(x) - self._solver.derivativeX(x)) / (s * s), spots)
+
+    def theta(self, spots):
+        return self._eval(lambda x, s: self._solver.thetaAt(x), spots)
+
+
+def _fd_profile(process, strike, option_type, exercise, ref_date, maturity, day_count, time_steps, grid_points,
+                spots=None):
+    """SpotProfile from the log-spot Fdm1DimSolver that FdBlackScholesVanillaEngine runs for a vanilla payoff.
+
+    Times are measured from ref_date with day_count, which should be the day count of the
+    process curves (as the engine's). The grid is centred as the engine's (on the process
+    spot) and widened when needed so that every spot in `spots` lies inside it. The solve
+    runs here, once."""
+    dc = day_count
+    T = dc.yearFraction(ref_date, maturity)
+
+    def mesher(x_min=nullDouble(), x_max=nullDouble()):
+        return FdmBlackScholesMesher(grid_points, process, T, strike, x_min, x_max, 1e-4, 1.5, (strike, 0.1))
+
+    mesh = mesher()
+    x = np.array(mesh.locations())
+    if spots is not None:
+        lo, hi = math.log(min(spots)), math.log(max(spots))
+        if lo <= x[1] or hi >= x[-2]:
+            width = x[-1] - x[0]
+            mesh = mesher(min(x[0], lo - 0.1 * width), max(x[-1], hi + 0.1 * width))
+            x = np.array(mesh.locations())
+    mesh = FdmMesherComposite(mesh)
+    calculator = FdmLogInnerValue(PlainVanillaPayoff(option_type, strike), mesh, 0)
+    conditions = FdmStepConditionComposite.vanillaComposite(DividendSchedule(), exercise, mesh, calculator, ref_date, dc)
+    desc = FdmSolverDesc(mesh, FdmBoundaryConditionSet(), conditions, calculator, T, time_steps, 0)
+    solver = Fdm1DimSolver(desc, FdmSchemeDesc.Douglas(), FdmBlackScholesOp(mesh, process, strike))
+    solver.interpolateAt(float(x[len(x) // 2]))  # solve now, while the inputs are current
+    return SpotProfile(solver, x)
+
+
 class FiniteDifferenceModel:
 
-    def __init__(self, market, time_steps: int = 100, grid_points: int = 100):
+    def __init__(self, market, time_steps: int = 100, grid_points: int = 100, cache_size: int = 1024, context=None,
+                 profile_cache_size: int = 256, tolerance: float | None = None, max_grid: int = 800):
         self.market = market
         self.time_steps = time_steps
         self.grid_points = grid_points
-        self.today = Date().todaysDate()
-        Settings.instance().evaluationDate = self.today
-
-    
-    def price(self, instrument):
-        """Price a European or American option using finite-difference engine"""
-        process = BlackScholesMertonProcess(
+        # accuracy-target mode: price() refines the grid until the error estimate is within tolerance
+        self.tolerance = tolerance
+        self.max_grid = max_grid
+        self.context = context or market.context
+        self.process = BlackScholesMertonProcess(
             self.market.spot_handle,
             self.market.q_handle,
             self.market.r_handle,
             self.market.vol_handle,
         )
-        payoff = PlainVanillaPayoff(instrument.option_type, instrument.strike)
+        self._engine = FdBlackScholesVanillaEngine(self.process, self.time_steps, self.grid_points)
+        self._options = _OptionCache(cache_size)
+        self._profiles = _OptionCache(profile_cache_size)
 
-        if getattr(instrument, "style", "European") == "American":
-            exercise = AmericanExercise(self.today, instrument.maturity)
-        else:
-            exercise = EuropeanExercise(instrument.maturity)
-        
-        ql_option = VanillaOption(payoff, exercise)
-        engine = FdBlackScholesVanillaEngine(process, self.time_steps, self.grid_points)
-        ql_option.setPricingEngine(engine)
+    def _option(self, instrument):
+        """Cached VanillaOption for the instrument with the FD engine attached."""
+        style = getattr(instrument, "style", "European")
+
+        def build():
+            payoff = PlainVanillaPayoff(instrument.option_type, instrument.strike)
+            if style == "American":
+                exercise = AmericanExercise(self.today, instrument.maturity)
+            else:
+                exercise = EuropeanExercise(instrument.maturity)
+            ql_option = VanillaOption(payoff, exercise)
+            ql_option.setPricingEngine(self._engine)
+            return ql_option
+
+        return self._options.get(_instrument_key(instrument, style), build)
+
+    @property
+    def today(self) -> Date:
+        return self.context.date
+    
+    def price(self, instrument):
+        """Price a European or American option using finite-difference engine"""
+        if self.tolerance is not None:
+            return self.price_to_tolerance(instrument, self.tolerance, max_grid=self.max_grid)[0]
+        with self.context.activate():
+            return float(self._option(instrument).NPV())
+
+    def _frozen_process(self):
+        """A process on the market's current quote and curves, unaffected by later market moves."""
+        mkt = self.market
+        return BlackScholesMertonProcess(
+            QuoteHandle(SimpleQuote(mkt.spot)),
+            YieldTermStructureHandle(mkt.q_handle.currentLink()),
+            YieldTermStructureHandle(mkt.r_handle.currentLink()),
+            BlackVolTermStructureHandle(mkt.vol_handle.currentLink()),
+        )
 
-        return float(ql_option.NPV())
+    def _exercise(self, instrument, style):
+        if style == "American":
+            return AmericanExercise(self.today, instrument.maturity)
+        return EuropeanExercise(instrument.maturity)
+
+    def _expired(self, instrument) -> bool:
+        """True when the option has no time left at the valuation date (the engine prices it at 0)."""
+        return instrument.maturity <= self.today
+
+    def price_to_tolerance(self, instrument, tolerance=1e-4, start: int = 50, max_grid: int = 800):
+        """Refine the grid until the extrapolated price is within tolerance; returns (price, error, (time_steps, grid_points)).
+
+        Solves on n x n grids for n = start, 2*start, ... up to max_grid. The convergence order p
+        is estimated from the last three solves (2 until three exist, clipped to [0.5, 4]).
+        The Richardson value v_n + (v_n - v_n/2) / (2^p - 1) is returned, with its change
+        from the previous grid's extrapolation as the error estimate; the run stops as soon
+        as the estimate is within tolerance, or at max_grid."""
+        style = getattr(instrument, "style", "European")
+        if self._expired(instrument):
+            return 0.0, 0.0, (0, 0)
+        process = self._frozen_process()
+        exercise = self._exercise(instrument, style)
+        values, n = [], start
+        price, error = float("nan"), float("inf")
+        while True:
+            with self.context.activate():
+                profile = _fd_profile(process, instrument.strike, instrument.option_type, exercise, self.today,
+                                      instrument.maturity, self.context.day_count, n, n)
+            values.append(float(profile.value(self.market.spot)))
+            if len(values) == 1:
+                price = values[0]
+            else:
+                order = 2.0
+                if len(values) >= 3:
+                    d1, d2 = values[-3] - values[-2], values[-2] - values[-1]
+                    if d1 * d2 > 0:
+                        order = min(max(math.log2(d1 / d2), 0.5), 4.0)
+                extrapolated = values[-1] + (values[-1] - values[-2]) / (2.0 ** order - 1.0)
+                if len(values) >= 3:
+                    error = abs(extrapolated - price)
+                price = extrapolated
+            if error <= tolerance or 2 * n > max_grid:
+                return price, error, (n, n)
+            n *= 2
+
+    def spot_profile(self, instrument, spots=None) -> SpotProfile:
+        """The instrument's solution over spot from one PDE solve, cached per instrument and market state.
+
+        The market state is the valuation date, r, q and the vol at the contract's strike and
+        maturity; spot moves reuse the cached solve while the spot (and any requested `spots`)
+        stays inside its grid. The least recently used profiles are evicted. Expired options
+        get a zero profile, as price() gives 0."""
+        if self._expired(instrument):
+            return SpotProfile.expired()
+        style = getattr(instrument, "style", "European")
+        mkt = self.market
+        variance = mkt.vol_handle.blackVariance(instrument.maturity, instrument.strike, True)
+        key = (_instrument_key(instrument, style), self.today.serialNumber(), mkt.r, mkt.q, variance)
+        needed = [mkt.spot] + ([] if spots is None else list(np.ravel(spots)))
+
+        def build():
+            # frozen copy of the current market, so later moves cannot touch the solved grid
+            process = self._frozen_process()
+            exercise = self._exercise(instrument, style)
+            with self.context.activate():
+                return _fd_profile(process, instrument.strike, instrument.option_type, exercise, self.today,
+                                   instrument.maturity, self.context.day_count, self.time_steps, self.grid_points,
+                                   spots=None if spots is None else needed)
+
+        profile = self._profiles.get(key, build)
+        if not profile.covers(needed):
+            self._profiles.pop(key)
+            profile = self._profiles.get(key, build)
+        return profile
+
+    def ladder(self, instrument, spot_shocks):
+        """Values at spot * (1 + shock) for each relative shock, from one cached solve."""
+        spots = self.market.spot * (1.0 + np.asarray(spot_shocks, dtype=float))
+        return self.spot_profile(instrument, spots).value(spots)
+
+    def greeks(self, instrument):
+        """Delta, gamma and theta at the current spot, read off the cached spot profile."""
+        profile = self.spot_profile(instrument)
+        spot = self.market.spot
+        return {"delta": float(profile.delta(spot)), "gamma": float(profile.gamma(spot)),
+                "theta": float(profile.theta(spot))}
     
     
 
@@ -0,0 +1,140 @@
+"""Multi-step GBM path generation and vectorized path-dependent payoff evaluators."""
+import math
+import numpy as np
+from QuantLib import Option as QLOption
+from .sampling import sobol_normal_blocks, brownian_bridge
+
+
+class GBMPathGenerator:
+    def __init__(self, spot, risk_free_rate, volatility, div_yield=0.0):
+        self.spot = float(spot)
+        self.r = float(risk_free_rate)
+        self.q = float(div_yield)
+        self.vol = float(volatility)
+
+    def iter_steps(self, times, num_paths, seed=None, antithetic=False, sampler="pseudo"):
+        """Yield the spot at each time in `times` (year fractions, increasing) across all paths.
+
+        With the pseudo-random sampler each step draws its own normals, so memory stays at
+        O(num_paths). Antithetic paths are laid out [Z, -Z] with the odd path last. With
+        sampler="sobol" the step normals are one Sobol point per path, assembled by a
+        Brownian bridge, which needs the full (steps x paths) draw up front."""
+        times = np.asarray(times, dtype=float)
+        drift = self.r - self.q - 0.5 * self.vol * self.vol
+        if sampler == "sobol":
+            Z = np.concatenate(list(sobol_normal_blocks(num_paths, len(times), seed, antithetic)), axis=-1)
+            W = brownian_bridge(Z.reshape(len(times), -1), times)
+            for t, W_t in zip(times, W):
+                S = np.multiply(W_t, self.vol)
+                S += drift * t
+                np.exp(S, out=S)
+                S *= self.spot
+                yield S
+            return
+        if sampler != "pseudo":
+            raise ValueError(f"Unsupported sampler: {sampler}")
+
+        rng = np.random.default_rng(seed) if seed is not None else np.random.default_rng()
+        half = num_paths // 2 if antithetic else num_paths
+        S = np.full(num_paths, self.spot)
+        prev_t = 0.0
+        for t in times:
+            dt = t - prev_t
+            prev_t = t
+            Z = rng.standard_normal(half)
+            if antithetic:
+                Z = np.concatenate([Z, -Z, rng.standard_normal(num_paths - 2 * half)])
+            growth = np.multiply(Z, self.vol * math.sqrt(dt), out=Z)
+            growth += drift * dt
+            np.exp(growth, out=growth)
+            S = S * growth
+            yield S
+
+    def paths(self, times, num_paths, seed=None, antithetic=False, sampler="pseudo"):
+        """Return the simulated spots as a (steps x paths) array; rows match iter_steps."""
+        out = np.empty((len(times), num_paths))
+        for i, S in enumerate(self.iter_steps(times, num_paths, seed, antithetic, sampler)):
+            out[i] = S
+        return out
+
+
+class _PathPayoff:
+    """Payoff evaluated from fixings streamed one step at a time: start -> update per fixing -> finish."""
+
+    def __call__(self, paths):
+        """Payoffs for a (fixings x paths) array whose last row is the spot at maturity."""
+        state = self.start(paths.shape[1])
+        for S in paths:
+            self.update(state, S)
+        return self.finish(state, paths[-1])
+
+    @staticmethod
+    def _vanilla(x, strike, option_type):
+        payoffs = np.subtract(x, strike) if option_type == QLOption.Call else np.subtract(strike, x)
+        return np.maximum(payoffs, 0.0, out=payoffs)
+
+
+class AsianPayoff(_PathPayoff):
+    def __init__(self, strike, option_type, average="arithmetic"):
+        if average not in {"arithmetic", "geometric"}:
+            raise ValueError(f"Unsupported average: {average}")
+        self.strike = float(strike)
+        self.option_type = option_type
+        self.average = average
+
+    def start(self, num_paths):
+        return {"sum": np.zeros(num_paths), "count": 0}
+
+    def update(self, state, S):
+        state["sum"] += S if self.average == "arithmetic" else np.log(S)
+        state["count"] += 1
+
+    def finish(self, state, S_T):
+        avg = state["sum"] / state["count"]
+        if self.average == "geometric":
+            np.exp(avg, out=avg)
+        return self._vanilla(avg, self.strike, self.option_type)
+
+
+class BarrierPayoff(_PathPayoff):
+    BARRIER_TYPES = {"up-and-out", "down-and-out", "up-and-in", "down-and-in"}
+
+    def __init__(self, strike, option_type, barrier, barrier_type, rebate=0.0):
+        if barrier_type not in self.BARRIER_TYPES:
+            raise ValueError(f"Unsupported barrier type: {barrier_type}")
+        self.strike = float(strike)
+        self.option_type = option_type
+        self.barrier = float(barrier)
+        self.barrier_type = barrier_type
+        self.rebate = float(rebate)
+
+    def start(self, num_paths):
+        return {"hit": np.zeros(num_paths, dtype=bool)}
+
+    def update(self, state, S):
+        state["hit"] |= (S >= self.barrier) if self.barrier_type.startswith("up") else (S <= self.barrier)
+
+    def finish(self, state, S_T):
+        """Vanilla payoff on live paths, rebate (paid at maturity) on the others."""
+        live = ~state["hit"] if self.barrier_type.endswith("out") else state["hit"]
+        return np.where(live, self._vanilla(S_T, self.strike, self.option_type), self.rebate)
+
+
+class LookbackPayoff(_PathPayoff):
+    def __init__(self, option_type, strike=None):
+        """Fixed-strike lookback on the extreme fixing, or floating-strike when strike is None."""
+        self.strike = None if strike is None else float(strike)
+        self.option_type = option_type
+
+    def start(self, num_paths):
+        return {"max": np.full(num_paths, -np.inf), "min": np.full(num_paths, np.inf)}
+
+    def update(self, state, S):
+        np.maximum(state["max"], S, out=state["max"])
+        np.minimum(state["min"], S, out=state["min"])
+
+    def finish(self, state, S_T):
+        call = self.option_type == QLOption.Call
+        if self.strike is None:
+            return S_T - state["min"] if call else state["max"] - S_T
+        return self._vanilla(state["max"] if call else state["min"], self.strike, self.option_type)
@@ -0,0 +1,69 @@
+"""Quasi-random samplers for Monte Carlo: scrambled Sobol points mapped to standard normals."""
+import warnings
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+_U_MIN = 2.0 ** -53
+
+
+def _sobol_normals(engine, n):
+    with warnings.catch_warnings():
+        # balance properties want n = 2^m; non-powers are still valid (just less uniform)
+        warnings.simplefilter("ignore", UserWarning)
+        U = engine.random(n)
+    np.clip(U, _U_MIN, 1.0 - _U_MIN, out=U)
+    return ndtri(U).T
+
+
+def sobol_normal_blocks(num_paths, dimension=1, seed=None, antithetic=False, chunk_size=None):
+    """Yield standard normals from one scrambled Sobol sequence in blocks of at most chunk_size.
+
+    Blocks are shaped (n,) for dimension 1 and (dimension, n) otherwise. Antithetic pairs
+    are laid out [Z, -Z] per block with the odd point last, as for pseudo-random draws.
+    The sequence is consumed in order, so the points do not depend on chunk_size."""
+    engine = qmc.Sobol(d=dimension, scramble=True, seed=np.random.default_rng(seed))
+    squeeze = (lambda Z: Z[0]) if dimension == 1 else (lambda Z: Z)
+    if antithetic:
+        half = num_paths // 2
+        step = max((chunk_size or num_paths) // 2, 1)
+        for start in range(0, half, step):
+            Z = _sobol_normals(engine, min(step, half - start))
+            yield squeeze(np.concatenate([Z, -Z], axis=1))
+        if 2 * half < num_paths:
+            yield squeeze(_sobol_normals(engine, 1))
+    else:
+        step = chunk_size or num_paths
+        for start in range(0, num_paths, step):
+            yield squeeze(_sobol_normals(engine, min(step, num_paths - start)))
+
+
+def _bridge_schedule(times):
+    """Brownian-bridge construction order for W(t_1..t_m): terminal point first, then midpoints breadth-first.
+
+    Each entry is (index, left, right, w_left, w_right, sd) with indices into [0, t_1, ..., t_m]."""
+    t = np.concatenate([[0.0], np.asarray(times, dtype=float)])
+    m = len(t) - 1
+    schedule = [(m, 0, m, 0.0, 0.0, float(np.sqrt(t[m])))]
+    queue = [(0, m)]
+    while queue:
+        left, right = queue.pop(0)
+        if right - left < 2:
+            continue
+        mid = (left + right) // 2
+        span = t[right] - t[left]
+        schedule.append((mid, left, right, (t[right] - t[mid]) / span, (t[mid] - t[left]) / span,
+                         float(np.sqrt((t[mid] - t[left]) * (t[right] - t[mid]) / span))))
+        queue += [(left, mid), (mid, right)]
+    return schedule
+
+
+def brownian_bridge(Z, times):
+    """Map (steps, n) standard normals to Brownian values W(t_i), shape (steps, n), in bridge order.
+
+    Row 0 of Z fixes W(T) and later rows fill in midpoints, so the best-distributed Sobol
+    dimensions drive the largest-scale moves of the path."""
+    W = np.zeros((Z.shape[0] + 1, Z.shape[1]))
+    for k, (i, left, right, w_left, w_right, sd) in enumerate(_bridge_schedule(times)):
+        W[i] = w_left * W[left] + w_right * W[right] + sd * Z[k]
+    return W[1:]
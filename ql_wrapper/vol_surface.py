@@ -2,6 +2,7 @@ from QuantLib import (Settings, Date, BlackVarianceSurface, QuoteHandle, SimpleQ
                       Actual365Fixed, NullCalendar, DateParser)
 import csv
 from typing import List, Tuple
+from .context import ValuationContext
 
 def read_chain_csv(filepath: str) -> List[Tuple[Date, float, float]]:
     """Read an option chain CSV (expiry,strike,iv) and return [(Date, strike, iv)] tuples."""
@@ -17,14 +18,15 @@ def read_chain_csv(filepath: str) -> List[Tuple[Date, float, float]]:
 
         return rows
 
-def build_vol_surface(chain_data: List[Tuple[Date, float, float]]) -> BlackVarianceSurface:
-    Settings.instance().evaluationDate = Date.todaysDate()
-    cal = NullCalendar()
-    dc = Actual365Fixed()
+def build_vol_surface(chain_data: List[Tuple[Date, float, float]], context: ValuationContext = None) -> BlackVarianceSurface:
+    """BlackVarianceSurface anchored at the context date (default: the current evaluation date)."""
+    context = context or ValuationContext()
+    cal = context.calendar
+    dc = context.day_count
     dates = sorted({d for (d, _, _) in chain_data})
     strikes = sorted({k for (_, k, _) in chain_data})
     iv_map = {(d, k): iv for (d, k, iv) in chain_data}
-    today = Settings.instance().evaluationDate
+    today = context.date
     vol_matrix = [[iv_map[(d, k)] for k in strikes] for d in dates]
     surface = BlackVarianceSurface(today, cal, dates, strikes, vol_matrix, dc)
     return surface
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+from QuantLib import (Settings, Date, Period, Months, Actual365Fixed, Option as QLOption, PlainVanillaPayoff,
+                      EuropeanExercise, VanillaOption, AnalyticEuropeanEngine, BlackScholesMertonProcess)
+from ql_wrapper.analytic import bs_greeks, chain_greeks
+from ql_wrapper.market import MarketParams
+
+def test_batch_greeks_match_analytic_european_engine():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(spot=100, risk_free_rate=0.03, div_yield=0.01, vol=0.25)
+    process = BlackScholesMertonProcess(mkt.spot_handle, mkt.q_handle, mkt.r_handle, mkt.vol_handle)
+
+    strikes, Ts, types, expected = [], [], [], {g: [] for g in ("price", "delta", "gamma", "vega", "theta", "rho")}
+    for months in (1, 6, 18):
+        mat = today + Period(months, Months)
+        for K in (80.0, 100.0, 125.0):
+            for t in (QLOption.Call, QLOption.Put):
+                opt = VanillaOption(PlainVanillaPayoff(t, K), EuropeanExercise(mat))
+                opt.setPricingEngine(AnalyticEuropeanEngine(process))
+                strikes.append(K); Ts.append(Actual365Fixed().yearFraction(today, mat)); types.append(t)
+                for g, f in (("price", opt.NPV), ("delta", opt.delta), ("gamma", opt.gamma),
+                             ("vega", opt.vega), ("theta", opt.theta), ("rho", opt.rho)):
+                    expected[g].append(f())
+
+    out = bs_greeks(100.0, np.array(strikes), np.array(Ts), np.array(types), 0.03, 0.01, 0.25)
+    for g, values in expected.items():
+        np.testing.assert_allclose(out[g], values, rtol=1e-7, atol=1e-10, err_msg=g)
+
+def test_chain_frame_input():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    exp = today + Period(6, Months)
+    chain = pd.DataFrame({"expiry": [exp.ISO()] * 2, "strike": [100.0, 100.0], "type": ["C", "P"],
+                          "implied_vol": [0.2, 0.2]})
+    out = chain_greeks(chain, spot=100.0, r=0.03)
+    T = Actual365Fixed().yearFraction(today, exp)
+    # put-call parity
+    assert abs(out["price"][0] - out["price"][1] - (100.0 - 100.0 * np.exp(-0.03 * T))) < 1e-10
+
+def test_zero_vol_is_discounted_forward_intrinsic():
+    S, K, T, r, q = 100.0, np.array([90.0, 100.0, 104.0, 110.0]), 0.5, 0.05, 0.01
+    fwd_gap = S * np.exp(-q * T) - K * np.exp(-r * T)
+    for w, t in ((1.0, QLOption.Call), (-1.0, QLOption.Put)):
+        out = bs_greeks(S, K, T, t, r, q, 0.0)
+        itm = w * fwd_gap > 0
+        np.testing.assert_allclose(out["price"], np.maximum(w * fwd_gap, 0.0), atol=1e-12)
+        np.testing.assert_allclose(out["delta"], np.where(itm, w * np.exp(-q * T), 0.0), atol=1e-12)
+        np.testing.assert_allclose(out["price"], bs_greeks(S, K, T, t, r, q, 1e-8)["price"], atol=1e-9)
+        assert not out["gamma"].any() and not out["vega"].any()
@@ -0,0 +1,77 @@
+import pytest
+from QuantLib import (Settings, Date, Option as QLOption, PlainVanillaPayoff, AmericanExercise, VanillaOption,
+                      BinomialVanillaEngine, BlackScholesMertonProcess)
+from ql_wrapper.market import MarketParams
+from ql_wrapper.instruments import Option
+from ql_wrapper.models import BlackScholesModel, FiniteDifferenceModel, MonteCarloModel
+from ql_wrapper.engines import ENGINES, calibrate, select_engine, EngineSelector
+
+def test_binomial_engine_type_is_used_for_americans():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(100, 0.04, 0.01, 0.25)
+    am = Option(100.0, today + 180, QLOption.Put, style="American")
+    model = BlackScholesModel(market=mkt, engine_type="binomial", binomial_steps=150)
+    process = BlackScholesMertonProcess(mkt.spot_handle, mkt.q_handle, mkt.r_handle, mkt.vol_handle)
+    ref = VanillaOption(PlainVanillaPayoff(QLOption.Put, 100.0), AmericanExercise(today, today + 180))
+    ref.setPricingEngine(BinomialVanillaEngine(process, "crr", 150))
+    assert model.price(am) == ref.NPV()
+    assert model.price(am) != BlackScholesModel(market=mkt).price(am)
+    eu = Option(100.0, today + 180, QLOption.Put)
+    assert model.price(eu) == BlackScholesModel(market=mkt).price(eu)
+    with pytest.raises(ValueError):
+        BlackScholesModel(market=mkt, engine_type="trinomial")
+
+def test_calibration_profiles_and_budgeted_selection():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(100, 0.04, 0.01, 0.25)
+    profiles = calibrate(mkt, engines=["analytic", "baw", "binomial-100", "fd-100"], reference_tolerance=1e-4,
+                         moneyness=(0.9, 1.1), days=(30, 182))
+    by_key = {(p["engine"], p["style"]): p for p in profiles}
+    assert set(by_key) == {("analytic", "European"), ("baw", "American"), ("binomial-100", "American"),
+                           ("fd-100", "European"), ("fd-100", "American")}
+    assert by_key["analytic", "European"]["error"] == 0.0
+    assert by_key["fd-100", "American"]["error"] < by_key["baw", "American"]["error"]
+    assert all(p["seconds"] > 0 for p in profiles)
+
+    loose = max(p["error"] for p in profiles) + 1.0
+    cheapest = min((p for p in profiles if p["style"] == "American"), key=lambda p: p["seconds"])
+    assert select_engine(profiles, "American", loose) is cheapest
+    tight = by_key["fd-100", "American"]["error"]
+    assert select_engine(profiles, "American", tight)["error"] <= tight
+    with pytest.raises(ValueError):
+        select_engine(profiles, "American", -1.0)
+
+def test_selector_routes_to_chosen_engine():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(100, 0.04, 0.01, 0.25)
+    profiles = [
+        {"engine": "analytic", "style": "European", "seconds": 1e-5, "error": 0.0, "mean_error": 0.0},
+        {"engine": "baw", "style": "American", "seconds": 1e-5, "error": 5e-2, "mean_error": 1e-2},
+        {"engine": "fd-100", "style": "American", "seconds": 1e-3, "error": 1e-2, "mean_error": 4e-3},
+    ]
+    am = Option(95.0, today + 120, QLOption.Put, style="American")
+    fast = EngineSelector(mkt, "fast", profiles=profiles)
+    accurate = EngineSelector(mkt, 2e-2, profiles=profiles)
+    assert fast.engines == {"European": "analytic", "American": "baw"}
+    assert accurate.engines["American"] == "fd-100"
+    assert fast.price(am) == BlackScholesModel(market=mkt).price(am)
+    assert accurate.price(am) == FiniteDifferenceModel(mkt, 100, 100).price(am)
+    with pytest.raises(ValueError):
+        EngineSelector(mkt, 2e-2, latency=1e-4, profiles=profiles)
+    with pytest.raises(ValueError):
+        EngineSelector(mkt, "eod", profiles=profiles)
+
+def test_mc_engine_follows_market_updates():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(100, 0.04, 0.01, 0.25)
+    _, factory, kwargs = ENGINES["mc-100k"]
+    model = factory(mkt)
+    opt = Option(100.0, today + 180, QLOption.Call)
+    before = model.price(opt, **kwargs)
+    mkt.update(spot=110, vol=0.3)
+    fresh = MonteCarloModel(110, 0.04, 0.3, 0.01, context=mkt.context)
+    assert model.price(opt, **kwargs) == fresh.price(opt, **kwargs) != before
@@ -0,0 +1,62 @@
+import numpy as np
+from QuantLib import Settings, Date, Period, Months, Actual360, Option as QLOption
+from ql_wrapper.context import ValuationContext
+from ql_wrapper.market import MarketParams
+from ql_wrapper.instruments import Option
+from ql_wrapper.models import FiniteDifferenceModel
+
+def _setup(**kwargs):
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(spot=100, risk_free_rate=0.05, div_yield=0.02, vol=0.25)
+    opt = Option(100.0, today + Period(6, Months), QLOption.Put, style="American")
+    return mkt, opt, FiniteDifferenceModel(mkt, **kwargs)
+
+def test_profile_reproduces_engine_at_current_spot():
+    mkt, opt, fd = _setup()
+    ql_option = fd._option(opt)
+    profile = fd.spot_profile(opt)
+    assert abs(profile.value(100.0) - fd.price(opt)) < 1e-12
+    g = fd.greeks(opt)
+    assert abs(g["delta"] - ql_option.delta()) < 1e-12
+    assert abs(g["gamma"] - ql_option.gamma()) < 1e-12
+    assert abs(g["theta"] - ql_option.theta()) < 1e-12
+
+def test_ladder_from_one_cached_solve():
+    mkt, opt, fd = _setup()
+    shocks = np.linspace(-0.2, 0.2, 21)
+    ladder = fd.ladder(opt, shocks)
+    profile = fd.spot_profile(opt)
+    assert len(fd._profiles) == 1 and fd.spot_profile(opt, 100 * (1 + shocks)) is profile
+    for s, v in zip(100 * (1 + shocks[::5]), ladder[::5]):
+        mkt.set_spot(s)
+        assert abs(v - fd.price(opt)) < 2e-3
+    # a spot move inside the grid keeps the solve; a vol move needs a new one
+    assert fd.spot_profile(opt) is profile
+    before = profile.value(100.0)
+    mkt.set_vol(0.3)
+    assert fd.spot_profile(opt) is not profile
+    assert profile.value(100.0) == before
+
+def test_wide_ladder_and_eviction():
+    mkt, opt, fd = _setup(profile_cache_size=2)
+    spots = np.array([20.0, 400.0])
+    assert fd.spot_profile(opt, spots).covers(spots)
+    for vol in (0.2, 0.3, 0.4):
+        mkt.set_vol(vol)
+        fd.spot_profile(opt)
+    assert len(fd._profiles) == 2
+
+def test_profile_follows_context_day_count_and_expiry():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(spot=100, risk_free_rate=0.05, div_yield=0.02, vol=0.25,
+                       context=ValuationContext(today, Actual360()))
+    fd = FiniteDifferenceModel(mkt)
+    opt = Option(100.0, today + 180, QLOption.Put, style="American")
+    assert abs(fd.spot_profile(opt).value(100.0) - fd.price(opt)) < 1e-12
+
+    expired = Option(100.0, today, QLOption.Put, style="American")
+    assert fd.price(expired) == 0.0
+    assert not fd.ladder(expired, [-0.1, 0.0, 0.1]).any()
+    assert fd.greeks(expired) == {"delta": 0.0, "gamma": 0.0, "theta": 0.0}
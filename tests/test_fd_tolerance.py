@@ -0,0 +1,38 @@
+from QuantLib import Settings, Date, Actual360, Option as QLOption
+from ql_wrapper.context import ValuationContext
+from ql_wrapper.market import MarketParams
+from ql_wrapper.instruments import Option
+from ql_wrapper.models import FiniteDifferenceModel, BlackScholesModel
+
+def test_tolerance_mode_reaches_fine_grid_accuracy():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(spot=100, risk_free_rate=0.05, div_yield=0.02, vol=0.25)
+    for K, days in ((100.0, 10), (70.0, 180), (100.0, 180)):
+        opt = Option(K, today + days, QLOption.Put, style="American")
+        reference = FiniteDifferenceModel(mkt, 1600, 1600).price(opt)
+        price, err, grid = FiniteDifferenceModel(mkt).price_to_tolerance(opt, 5e-4)
+        assert err <= 5e-4 and grid[0] <= 800
+        assert abs(price - reference) < 5e-4
+
+def test_european_extrapolation_and_price_mode():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(spot=100, risk_free_rate=0.05, div_yield=0.02, vol=0.2)
+    opt = Option(105.0, today + 200, QLOption.Call)
+    exact = BlackScholesModel(market=mkt).price(opt)
+    fd = FiniteDifferenceModel(mkt, tolerance=1e-5)
+    price, err, grid = fd.price_to_tolerance(opt, 1e-5)
+    assert abs(price - exact) < 2e-5 and grid[0] < 800
+    assert fd.price(opt) == price
+    assert FiniteDifferenceModel(mkt).price_to_tolerance(Option(100.0, today, QLOption.Put)) == (0.0, 0.0, (0, 0))
+
+def test_tolerance_mode_under_non_act365_context():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(spot=100, risk_free_rate=0.05, div_yield=0.02, vol=0.25,
+                       context=ValuationContext(today, Actual360()))
+    opt = Option(100.0, today + 180, QLOption.Put, style="American")
+    reference = FiniteDifferenceModel(mkt, 1600, 1600).price(opt)
+    price, err, _ = FiniteDifferenceModel(mkt).price_to_tolerance(opt, 5e-4)
+    assert err <= 5e-4 and abs(price - reference) < 5e-4
@@ -0,0 +1,24 @@
+import numpy as np
+from ql_wrapper.analytic import bs_price, implied_vol
+
+def test_implied_vol_round_trip_and_arbitrage_mask():
+    rng = np.random.default_rng(0)
+    n = 5_000
+    S, r, q = 100.0, 0.03, 0.01
+    K = rng.uniform(50, 160, n)
+    T = rng.uniform(0.02, 3.0, n)
+    types = np.where(rng.random(n) < 0.5, "C", "P")
+    vols = rng.uniform(0.05, 1.2, n)
+    prices = bs_price(S, K, T, types, r, q, vols)
+
+    solved = implied_vol(prices, S, K, T, types, r, q)
+    # quotes whose time value is lost in rounding carry no vol information
+    otm_side = np.where(K * np.exp(-r * T) >= S * np.exp(-q * T), "C", "P")
+    informative = bs_price(S, K, T, otm_side, r, q, vols) > 1e-6
+    ok = np.isfinite(solved)
+    assert ok[informative].mean() > 0.99
+    np.testing.assert_allclose(solved[ok & informative], vols[ok & informative], rtol=1e-6, atol=1e-6)
+
+    # below intrinsic, above the spot bound, expired
+    bad = implied_vol([1.0, 150.0, 5.0], S, [80.0, 100.0, 100.0], [1.0, 1.0, 0.0], "C", r, q)
+    assert np.isnan(bad).all()
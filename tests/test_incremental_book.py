@@ -0,0 +1,77 @@
+import numpy as np
+from QuantLib import Settings, Date, Period, Months, Option as QLOption
+from ql_wrapper.context import ValuationContext
+from ql_wrapper.market import MarketParams
+from ql_wrapper.instruments import Option, IncrementalBook
+from ql_wrapper.models import BlackScholesModel, FiniteDifferenceModel
+
+def _book():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt_a = MarketParams(spot=100, risk_free_rate=0.03, vol=0.2)
+    mkt_b = MarketParams(spot=50, risk_free_rate=0.03, vol=0.3)
+    model_a, model_b = BlackScholesModel(market=mkt_a), FiniteDifferenceModel(mkt_b)
+    book, positions = IncrementalBook(), []
+    for m in (3, 6, 12):
+        for t in (QLOption.Call, QLOption.Put):
+            for model, K in ((model_a, 100.0), (model_b, 50.0)):
+                opt = Option(K, today + Period(m, Months), t, style="American" if model is model_b else "European")
+                qty = float(len(positions) + 1)
+                book.add(opt, model, qty)
+                positions.append((opt, model, qty))
+    return book, positions, mkt_a, mkt_b
+
+def _full_total(positions):
+    return sum(q * model.price(opt) for opt, model, q in positions)
+
+def test_only_ticked_name_is_repriced():
+    book, positions, mkt_a, mkt_b = _book()
+    assert abs(book.total - _full_total(positions)) < 1e-9
+    mkt_a.set_spot(103)
+    assert book.dirty == 6
+    book.revalue()
+    assert book.last_repriced == 6
+    assert abs(book.total - _full_total(positions)) < 1e-9
+
+    mkt_b.update(spot=48, vol=0.35)
+    assert book.dirty == 6
+    book.revalue()
+    assert abs(book.total - _full_total(positions)) < 1e-9
+    assert book.revalue() == book.total and book.last_repriced == 0
+
+def test_evaluation_date_marks_everything_dirty_and_duplicates_share_contracts():
+    book, positions, mkt_a, _ = _book()
+    opt, model, _ = positions[0]
+    book.add(opt, model, -2.0)
+    assert len(book) == len(positions) + 1
+    np.testing.assert_allclose(book.values()[[0, -1]], np.array([1.0, -2.0]) * model.price(opt))
+    Settings.instance().evaluationDate = Date.todaysDate() + 7
+    try:
+        assert book.dirty == 12
+        book.revalue()
+        assert abs(book.total - _full_total(positions + [(opt, model, -2.0)])) < 1e-9
+    finally:
+        Settings.instance().evaluationDate = Date.todaysDate()
+
+def test_markets_on_different_dates_reprice_only_the_ticked_one():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt_a = MarketParams(100, 0.03, vol=0.2, context=ValuationContext(today))
+    mkt_b = MarketParams(100, 0.03, vol=0.2, context=ValuationContext(today + 1))
+    book, positions = IncrementalBook(), []
+    for mkt in (mkt_a, mkt_b):
+        model = BlackScholesModel(market=mkt)
+        for i in range(50):
+            opt = Option(80.0 + i, today + 90 + i, QLOption.Put, style="American")
+            book.add(opt, model)
+            positions.append((opt, model, 1.0))
+    assert book.dirty == 0
+    mkt_a.set_spot(101)
+    assert book.dirty == 50
+    book.revalue()
+    assert book.last_repriced == 50 and book.dirty == 0
+    mkt_b.set_spot(99)
+    book.revalue()
+    assert book.last_repriced == 50 and book.dirty == 0
+    assert book.revalue() == book.total and book.last_repriced == 0
+    assert abs(book.total - _full_total(positions)) < 1e-9
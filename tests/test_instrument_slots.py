@@ -0,0 +1,24 @@
+from QuantLib import Date, Period, Months, Option as QLOption
+from ql_wrapper.instruments import Option, AsianOption
+
+def test_slotted_option_has_no_instance_dict_and_lazy_meta():
+    today = Date.todaysDate()
+    opt = Option(100.0, today + Period(6, Months), QLOption.Call)
+    assert not hasattr(opt, "__dict__")
+    assert opt._meta is None
+    opt.meta["desk"] = "vol"
+    assert opt.meta == {"desk": "vol"}
+    assert Option(100.0, today, QLOption.Put, book="A").meta == {"book": "A"}
+
+    fixings = [today + Period(m, Months) for m in (1, 2, 3)]
+    asian = AsianOption(100.0, fixings[-1], QLOption.Call, fixings)
+    assert not hasattr(asian, "__dict__")
+
+def test_value_key_is_hashable():
+    today = Date.todaysDate()
+    mat = today + Period(3, Months)
+    a = Option(95.0, mat, QLOption.Put, style="American")
+    b = Option(95.0, Date(mat.serialNumber()), QLOption.Put, style="American")
+    c = Option(95.0, mat, QLOption.Put)
+    assert a.key == b.key and a.key != c.key
+    assert len({a.key, b.key, c.key}) == 2
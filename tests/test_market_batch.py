@@ -0,0 +1,67 @@
+from QuantLib import Settings, Date, Period, Months, Option as QLOption, Observer, ObservableSettings
+from ql_wrapper.market import MarketParams
+from ql_wrapper.instruments import Option
+from ql_wrapper.models import BlackScholesModel
+
+def _watch(ql_option):
+    count = [0]
+    observer = Observer(lambda: count.__setitem__(0, count[0] + 1))
+    observer.registerWith(ql_option)
+    return count, observer
+
+def test_update_notifies_once_and_reprices():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(spot=100, risk_free_rate=0.03, div_yield=0.0, vol=0.2)
+    model = BlackScholesModel(market=mkt)
+    opt = Option(100.0, today + Period(6, Months), QLOption.Call)
+    model.price(opt)
+    count, _obs = _watch(model._option(opt))
+
+    mkt.update(spot=105, r=0.04, q=0.01, vol=0.25)
+    assert count[0] == 1
+    assert ObservableSettings.instance().updatesEnabled()
+
+    fresh_mkt = MarketParams(spot=105, risk_free_rate=0.04, div_yield=0.01, vol=0.25)
+    assert abs(model.price(opt) - BlackScholesModel(market=fresh_mkt).price(opt)) < 1e-12
+
+    # unbatched setters notify once per call
+    count[0] = 0
+    for move in (lambda: mkt.set_spot(100), lambda: mkt.set_rate(0.03), lambda: mkt.set_vol(0.2)):
+        move()
+        model.price(opt)
+    assert count[0] == 3
+
+def test_nested_batches_flush_on_outer_exit():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(spot=100, risk_free_rate=0.03, vol=0.2)
+    model = BlackScholesModel(market=mkt)
+    opt = Option(100.0, today + Period(6, Months), QLOption.Put)
+    model.price(opt)
+    count, _obs = _watch(model._option(opt))
+    with mkt.batch():
+        mkt.set_spot(95)
+        with mkt.batch():
+            mkt.set_vol(0.3)
+        assert count[0] == 0
+    assert count[0] == 1
+    assert mkt.spot_handle.value() == 95
+
+def test_batch_defers_only_its_own_market():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt, other = MarketParams(spot=100, risk_free_rate=0.03, vol=0.2), MarketParams(spot=50, risk_free_rate=0.03, vol=0.3)
+    model, other_model = BlackScholesModel(market=mkt), BlackScholesModel(market=other)
+    opt = Option(100.0, today + Period(6, Months), QLOption.Call)
+    model.price(opt)
+    other_model.price(opt)
+    count, _obs = _watch(model._option(opt))
+    other_count, _other_obs = _watch(other_model._option(opt))
+    with mkt.batch():
+        mkt.update(spot=101, vol=0.25)
+        other.set_spot(51)
+        assert ObservableSettings.instance().updatesEnabled()
+        assert other_count[0] == 1 and count[0] == 0
+        assert mkt.spot_handle.value() == 100
+    assert count[0] == 1 and mkt.spot_handle.value() == 101
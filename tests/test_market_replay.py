@@ -0,0 +1,48 @@
+import numpy as np
+from QuantLib import Settings, Date, Period, Months, Option as QLOption
+from ql_wrapper.market import MarketParams
+from ql_wrapper.instruments import Option
+from ql_wrapper.models import BlackScholesModel
+
+ROWS = [(100.0, 0.03, 0.20), (101.0, 0.03, 0.21), (99.5, 0.031, 0.19), (102.0, 0.029, 0.22), (98.0, 0.03, 0.25)]
+
+def _setup():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    book = [Option(K, today + Period(6, Months), t) for K in (95.0, 105.0) for t in (QLOption.Call, QLOption.Put)]
+    mkt = MarketParams(spot=100, risk_free_rate=0.03, vol=0.2)
+    return book, mkt, BlackScholesModel(market=mkt)
+
+def _expected(book, spot, r, vol):
+    ref = MarketParams(spot=spot, risk_free_rate=r, vol=vol)
+    model = BlackScholesModel(market=ref)
+    return np.array([model.price(o) for o in book])
+
+def test_replay_csv_prices_every_tick(tmp_path):
+    path = tmp_path / "ticks.csv"
+    path.write_text("timestamp,spot,risk_free_rate,vol\n" +
+                    "".join(f"{i},{s},{r},{v}\n" for i, (s, r, v) in enumerate(ROWS)))
+    book, mkt, model = _setup()
+    out = list(mkt.replay(str(path), book, model))
+    assert len(out) == len(ROWS)
+    for (snapshot, prices), (s, r, v) in zip(out, ROWS):
+        assert snapshot == {"spot": s, "r": r, "vol": v}
+        np.testing.assert_allclose(prices, _expected(book, s, r, v), rtol=1e-12)
+
+def test_replay_coalesces_iterator_snapshots():
+    book, mkt, model = _setup()
+    ticks = ({"spot": s, "r": r, "vol": v} for s, r, v in ROWS)
+    out = list(mkt.replay(ticks, book, model, coalesce=2))
+    assert len(out) == 3
+    assert out[-1][0]["spot"] == 98.0
+    np.testing.assert_allclose(out[1][1], _expected(book, *ROWS[3]), rtol=1e-12)
+    assert (mkt.spot, mkt.r, mkt.vol) == ROWS[-1]
+
+def test_partial_rows_keep_previous_values(tmp_path):
+    path = tmp_path / "ticks.csv"
+    path.write_text("spot,vol\n101,\n,0.3\n")
+    mkt = MarketParams(spot=100, risk_free_rate=0.03, vol=0.2)
+    assert list(MarketParams.iter_csv(str(path))) == [{"spot": 101.0}, {"vol": 0.3}]
+    for snapshot in MarketParams.iter_csv(str(path)):
+        mkt.apply(snapshot)
+    assert (mkt.spot, mkt.vol) == (101.0, 0.3)
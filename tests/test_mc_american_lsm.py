@@ -0,0 +1,36 @@
+import pytest
+from QuantLib import Settings, Date, Period, Months, Option as QLOption
+from ql_wrapper.market import MarketParams
+from ql_wrapper.models import FiniteDifferenceModel, MonteCarloModel
+from ql_wrapper.instruments import Option
+
+def test_lsm_matches_finite_difference_for_american_puts():
+    Settings.instance().evaluationDate = Date.todaysDate()
+    mat = Date.todaysDate() + Period(12, Months)
+    mkt = MarketParams(spot=100, risk_free_rate=0.05, div_yield=0.0, vol=0.25)
+    fd = FiniteDifferenceModel(mkt, time_steps=400, grid_points=400)
+    mc = MonteCarloModel(spot=100, risk_free_rate=0.05, volatility=0.25)
+
+    puts = [Option(strike=k, maturity_date=mat, option_type=QLOption.Put, style="American") for k in (90, 100, 110)]
+    batch = mc.price_american(puts, num_paths=50_000, seed=8, antithetic=True)
+    for opt, (p, se) in zip(puts, batch):
+        p_fd = fd.price(opt)
+        assert abs(p - p_fd) <= 3 * se + 0.03
+        european = mc.price(Option(strike=opt.strike, maturity_date=mat, option_type=QLOption.Put),
+                            num_paths=50_000, seed=8, antithetic=True)
+        assert p > european
+
+    # style dispatch from price_and_se, and the european control variate
+    assert mc.price_and_se(puts[1], num_paths=50_000, seed=8, antithetic=True) == batch[1]
+    p_cv, se_cv = mc.price_and_se(puts[1], num_paths=50_000, seed=8, antithetic=True, control_variate="bs")
+    assert se_cv < batch[1][1] and abs(p_cv - fd.price(puts[1])) <= 3 * se_cv + 0.03
+
+def test_european_only_estimators_reject_american_options():
+    Settings.instance().evaluationDate = Date.todaysDate()
+    put = Option(strike=100, maturity_date=Date.todaysDate() + Period(6, Months), option_type=QLOption.Put,
+                 style="American")
+    mc = MonteCarloModel(spot=100, risk_free_rate=0.05, volatility=0.25)
+    with pytest.raises(ValueError, match="greeks_american"):
+        mc.greeks(put, num_paths=1000, seed=1)
+    with pytest.raises(ValueError, match="price_american"):
+        mc.price_batch([put], num_paths=1000, seed=1)
@@ -0,0 +1,38 @@
+from QuantLib import Settings, Date, Period, Months, Option as QLOption
+from ql_wrapper.market import MarketParams
+from ql_wrapper.models import BlackScholesModel, MonteCarloModel
+from ql_wrapper.instruments import Option
+
+def test_bumped_greeks_reuse_one_cached_draw_array():
+    Settings.instance().evaluationDate = Date.todaysDate()
+    mat = Date.todaysDate() + Period(6, Months)
+    opt = Option(strike=100, maturity_date=mat, option_type=QLOption.Call)
+    mc = MonteCarloModel(spot=100, risk_free_rate=0.03, volatility=0.20, div_yield=0.01,
+                         draw_cache_bytes=50_000 * 8 + 2 * 1_000 * 8)
+
+    mc.delta(opt, num_paths=50_000, seed=5)
+    mc.gamma(opt, num_paths=50_000, seed=5)
+    mc.vega(opt, num_paths=50_000, seed=5)
+    assert list(mc._draw_cache) == [(5, 50_000, True, "pseudo", None)]
+    assert mc.spot == 100 and mc.vol == 0.20
+
+    for seed in (6, 7, 8):
+        mc.price_and_se(opt, num_paths=1_000, seed=seed)
+    assert list(mc._draw_cache) == [(s, 1_000, False, "pseudo", None) for s in (6, 7, 8)]  # byte bound
+    assert mc._draw_cache.nbytes == 3 * 1_000 * 8
+
+    mc.price_and_se(opt, num_paths=100_000, seed=9)
+    assert len(mc._draw_cache) == 3  # larger than the whole budget: not cached
+
+def test_unseeded_bumps_use_common_random_numbers():
+    Settings.instance().evaluationDate = Date.todaysDate()
+    mat = Date.todaysDate() + Period(6, Months)
+    opt = Option(strike=100, maturity_date=mat, option_type=QLOption.Call)
+    mkt = MarketParams(spot=100, risk_free_rate=0.03, div_yield=0.01, vol=0.20)
+    true_delta = BlackScholesModel(market=mkt).greeks(opt)["delta"]
+    mc = MonteCarloModel(spot=100, risk_free_rate=0.03, volatility=0.20, div_yield=0.01)
+
+    # with independent draws the 2*bump denominator would amplify MC noise ~100x
+    deltas = [mc.delta(opt, num_paths=20_000, bump=0.01) for _ in range(5)]
+    assert max(abs(d - true_delta) for d in deltas) < 0.02
+    assert len(mc._draw_cache) == 0  # one-off CRN draws stay out of the shared cache
@@ -0,0 +1,26 @@
+import math
+from QuantLib import (Settings, Date, Period, Months, Option as QLOption, PlainVanillaPayoff, EuropeanExercise,
+                      VanillaOption, AnalyticEuropeanEngine, BlackScholesMertonProcess)
+from ql_wrapper.market import MarketParams
+from ql_wrapper.models import MonteCarloModel
+from ql_wrapper.instruments import Option
+
+def test_single_simulation_greeks_match_analytic():
+    Settings.instance().evaluationDate = Date.todaysDate()
+    mat = Date.todaysDate() + Period(6, Months)
+    mkt = MarketParams(spot=100, risk_free_rate=0.03, div_yield=0.01, vol=0.20)
+    process = BlackScholesMertonProcess(mkt.spot_handle, mkt.q_handle, mkt.r_handle, mkt.vol_handle)
+    mc = MonteCarloModel(spot=100, risk_free_rate=0.03, volatility=0.20, div_yield=0.01)
+
+    for opt_type in (QLOption.Call, QLOption.Put):
+        ql_opt = VanillaOption(PlainVanillaPayoff(opt_type, 95.0), EuropeanExercise(mat))
+        ql_opt.setPricingEngine(AnalyticEuropeanEngine(process))
+        expected = {"price": ql_opt.NPV(), "delta": ql_opt.delta(), "gamma": ql_opt.gamma(),
+                    "vega": ql_opt.vega(), "rho": ql_opt.rho(), "theta": ql_opt.theta()}
+
+        opt = Option(strike=95, maturity_date=mat, option_type=opt_type)
+        g = mc.greeks(opt, num_paths=200_000, seed=11, antithetic=True)
+        for name, value in expected.items():
+            assert math.isfinite(g[f"{name}_se"]) and g[f"{name}_se"] > 0
+            assert abs(g[name] - value) <= 4 * g[f"{name}_se"] + 1e-3, name
+    assert mc.spot == 100 and mc.vol == 0.20
@@ -0,0 +1,19 @@
+from QuantLib import Settings, Date, Period, Months, Option as QLOption
+from ql_wrapper.market import MarketParams
+from ql_wrapper.models import BlackScholesModel, MonteCarloModel
+from ql_wrapper.instruments import Option
+
+def test_parallel_result_independent_of_worker_count():
+    Settings.instance().evaluationDate = Date.todaysDate()
+    mat = Date.todaysDate() + Period(6, Months)
+    opt = Option(strike=100, maturity_date=mat, option_type=QLOption.Call)
+    mc = MonteCarloModel(spot=100, risk_free_rate=0.03, volatility=0.20, div_yield=0.01)
+
+    runs = [mc.price_and_se(opt, num_paths=200_001, seed=21, antithetic=True, chunk_size=20_000, workers=w)
+            for w in (1, 2, 3)]
+    assert runs[0] == runs[1] == runs[2]
+
+    mkt = MarketParams(spot=100, risk_free_rate=0.03, div_yield=0.01, vol=0.20)
+    p_bs = BlackScholesModel(market=mkt).price(opt)
+    p_mc, se = runs[0]
+    assert abs(p_mc - p_bs) <= 3 * se + 0.005
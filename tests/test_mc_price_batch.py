@@ -0,0 +1,18 @@
+from QuantLib import Settings, Date, Period, Months, Option as QLOption
+from ql_wrapper.models import MonteCarloModel
+from ql_wrapper.instruments import Option
+
+def test_batch_matches_single_pricing_per_instrument():
+    Settings.instance().evaluationDate = Date.todaysDate()
+    today = Date.todaysDate()
+    mc = MonteCarloModel(spot=100, risk_free_rate=0.03, volatility=0.20, div_yield=0.01)
+
+    chain = [Option(strike=k, maturity_date=today + Period(m, Months), option_type=t)
+             for m in (3, 6) for k in (90, 100, 110) for t in (QLOption.Call, QLOption.Put)]
+    chain.append(Option(strike=100, maturity_date=today - Period(1, Months), option_type=QLOption.Call))
+
+    batch = mc.price_batch(chain, num_paths=20_001, seed=5, antithetic=True)
+    assert len(batch) == len(chain)
+    for opt, (p, se) in zip(chain, batch):
+        assert (p, se) == mc.price_and_se(opt, num_paths=20_001, seed=5, antithetic=True)
+    assert batch[-1] == (0.0, 0.0)
@@ -0,0 +1,41 @@
+from QuantLib import (
+    Settings, Date, Period, Months, Actual365Fixed, PlainVanillaPayoff, EuropeanExercise,
+    BlackScholesMertonProcess, VanillaOption, SimpleQuote, QuoteHandle, YieldTermStructureHandle,
+    FlatForward, BlackVolTermStructureHandle, BlackConstantVol, MCEuropeanEngine, Option as QLOption, NullCalendar
+)
+from ql_wrapper.market import MarketParams
+from ql_wrapper.models import BlackScholesModel, MonteCarloModel
+from ql_wrapper.instruments import Option
+
+def test_sobol_hits_bs_with_much_smaller_error():
+    Settings.instance().evaluationDate = Date.todaysDate()
+    mat = Date.todaysDate() + Period(6, Months)
+    opt = Option(strike=100, maturity_date=mat, option_type=QLOption.Call)
+
+    mkt = MarketParams(spot=100, risk_free_rate=0.03, div_yield=0.01, vol=0.20)
+    p_bs = BlackScholesModel(market=mkt).price(opt)
+    mc = MonteCarloModel(spot=100, risk_free_rate=0.03, volatility=0.20, div_yield=0.01)
+
+    N = 16 * 4096
+    p_qmc, se_qmc = mc.price_and_se(opt, num_paths=N, seed=3, sampler="sobol", replications=16)
+    _, se_mc = mc.price_and_se(opt, num_paths=N, seed=3)
+    assert abs(p_qmc - p_bs) <= 4 * se_qmc + 1e-4
+    assert se_qmc < 0.2 * se_mc
+
+def test_sobol_agrees_with_quantlib_low_discrepancy_engine():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mat = today + Period(6, Months)
+    dc = Actual365Fixed()
+    process = BlackScholesMertonProcess(
+        QuoteHandle(SimpleQuote(100.0)),
+        YieldTermStructureHandle(FlatForward(today, 0.0, dc)),
+        YieldTermStructureHandle(FlatForward(today, 0.03, dc)),
+        BlackVolTermStructureHandle(BlackConstantVol(today, NullCalendar(), 0.20, dc)))
+    ql_opt = VanillaOption(PlainVanillaPayoff(QLOption.Put, 100.0), EuropeanExercise(mat))
+    ql_opt.setPricingEngine(MCEuropeanEngine(process, "lowdiscrepancy", timeSteps=1, requiredSamples=32768))
+
+    inst = Option(strike=100, maturity_date=mat, option_type=QLOption.Put)
+    mc = MonteCarloModel(spot=100.0, risk_free_rate=0.03, volatility=0.20)
+    p, se = mc.price_and_se(inst, num_paths=32768, seed=42, sampler="sobol")
+    assert abs(p - ql_opt.NPV()) <= 3.0 * se + 2e-3
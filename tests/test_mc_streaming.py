@@ -0,0 +1,30 @@
+import math
+import tracemalloc
+from QuantLib import Settings, Date, Period, Months, Option as QLOption
+from ql_wrapper.models import MonteCarloModel
+from ql_wrapper.instruments import Option
+
+def test_chunked_result_independent_of_chunk_size():
+    Settings.instance().evaluationDate = Date.todaysDate()
+    mat = Date.todaysDate() + Period(6, Months)
+    opt = Option(strike=100, maturity_date=mat, option_type=QLOption.Put)
+    mc = MonteCarloModel(spot=100, risk_free_rate=0.03, volatility=0.20, div_yield=0.01)
+
+    for antithetic in (False, True):
+        p_ref, se_ref = mc.price_and_se(opt, num_paths=50_001, seed=9, antithetic=antithetic)
+        for chunk in (1_000, 4_096, 33_333, 100_000):
+            p, se = mc.price_and_se(opt, num_paths=50_001, seed=9, antithetic=antithetic, chunk_size=chunk)
+            assert math.isclose(p, p_ref, rel_tol=1e-12)
+            assert math.isclose(se, se_ref, rel_tol=1e-9)
+
+def test_chunked_peak_memory_is_bounded_by_chunk():
+    Settings.instance().evaluationDate = Date.todaysDate()
+    mat = Date.todaysDate() + Period(6, Months)
+    opt = Option(strike=100, maturity_date=mat, option_type=QLOption.Call)
+    mc = MonteCarloModel(spot=100, risk_free_rate=0.03, volatility=0.20, div_yield=0.01)
+
+    tracemalloc.start()
+    mc.price_and_se(opt, num_paths=2_000_000, seed=1, chunk_size=10_000)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < 2_000_000  # a full 2e6-path array alone would be 16 MB
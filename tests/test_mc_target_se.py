@@ -0,0 +1,24 @@
+import pytest
+from QuantLib import Settings, Date, Period, Months, Option as QLOption
+from ql_wrapper.models import MonteCarloModel
+from ql_wrapper.instruments import Option
+
+def test_stops_once_target_se_reached():
+    Settings.instance().evaluationDate = Date.todaysDate()
+    mat = Date.todaysDate() + Period(6, Months)
+    mc = MonteCarloModel(spot=100, risk_free_rate=0.03, volatility=0.20, div_yield=0.01)
+    atm = Option(strike=100, maturity_date=mat, option_type=QLOption.Call)
+
+    price, se, used = mc.price_to_target(atm, target_se=0.02, max_paths=2_000_000, batch_size=10_000, seed=4)
+    assert se <= 0.02 and used < 2_000_000
+    assert (price, se) == pytest.approx(mc.price_and_se(atm, num_paths=used, seed=4, chunk_size=10_000), rel=1e-12)
+
+    # relative targets: ITM options converge in far fewer paths than OTM ones
+    itm = Option(strike=80, maturity_date=mat, option_type=QLOption.Call)
+    otm = Option(strike=130, maturity_date=mat, option_type=QLOption.Call)
+    _, _, used_itm = mc.price_to_target(itm, target_rel_se=0.002, max_paths=5_000_000, batch_size=10_000, seed=4)
+    _, _, used_otm = mc.price_to_target(otm, target_rel_se=0.002, max_paths=5_000_000, batch_size=10_000, seed=4)
+    assert used_itm < used_otm
+
+    _, se_cap, used_cap = mc.price_to_target(otm, target_se=1e-6, max_paths=30_000, batch_size=10_000, seed=4)
+    assert used_cap == 30_000 and se_cap > 1e-6
@@ -0,0 +1,42 @@
+import math
+import numpy as np
+from QuantLib import Settings, Date, Period, Months, Actual365Fixed, Option as QLOption
+from ql_wrapper.models import MonteCarloModel
+from ql_wrapper.instruments import Option
+
+def _loop_price_and_se(S0, r, q, vol, opt, N, seed, antithetic):
+    # reference: the original per-path Python loop
+    T = Actual365Fixed().yearFraction(Settings.instance().evaluationDate, opt.maturity)
+    rng = np.random.default_rng(seed)
+    if antithetic:
+        Zs = rng.standard_normal(N // 2)
+        Zs = np.concatenate([Zs, -Zs])
+    else:
+        Zs = rng.standard_normal(N)
+    if Zs.size < N:
+        Zs = np.concatenate([Zs, rng.standard_normal(1)])
+    mu = (r - q - 0.5 * vol * vol) * T
+    sig = vol * math.sqrt(T)
+    payoffs = []
+    for Z in Zs:
+        ST = S0 * math.exp(mu + sig * Z)
+        payoffs.append(max(ST - opt.strike, 0.0) if opt.option_type == QLOption.Call else max(opt.strike - ST, 0.0))
+    mean = sum(payoffs) / N
+    var = sum((x - mean) ** 2 for x in payoffs) / (N - 1)
+    disc = math.exp(-r * T)
+    return disc * mean, disc * math.sqrt(var / N)
+
+def test_vectorized_kernel_matches_path_loop():
+    Settings.instance().evaluationDate = Date.todaysDate()
+    mat = Date.todaysDate() + Period(6, Months)
+    mc = MonteCarloModel(spot=100, risk_free_rate=0.03, volatility=0.20, div_yield=0.01)
+
+    for opt_type in (QLOption.Call, QLOption.Put):
+        opt = Option(strike=105, maturity_date=mat, option_type=opt_type)
+        for antithetic in (False, True):
+            N = 10_001  # odd N exercises the extra-draw branch
+            p, se = mc.price_and_se(opt, num_paths=N, seed=3, antithetic=antithetic)
+            p_ref, se_ref = _loop_price_and_se(100.0, 0.03, 0.01, 0.20, opt, N, 3, antithetic)
+            assert math.isclose(p, p_ref, rel_tol=1e-12)
+            assert math.isclose(se, se_ref, rel_tol=1e-10)
+            assert mc.price(opt, num_paths=N, seed=3, antithetic=antithetic) == p
@@ -0,0 +1,31 @@
+from QuantLib import Settings, Date, Period, Months, Option as QLOption
+from ql_wrapper.market import MarketParams
+from ql_wrapper.models import BlackScholesModel, FiniteDifferenceModel
+from ql_wrapper.instruments import Option
+
+def test_cached_options_track_market_moves():
+    Settings.instance().evaluationDate = Date.todaysDate()
+    mat = Date.todaysDate() + Period(6, Months)
+    mkt = MarketParams(spot=100, risk_free_rate=0.03, div_yield=0.01, vol=0.20)
+    bs = BlackScholesModel(market=mkt, cache_size=2)
+    fd = FiniteDifferenceModel(mkt, cache_size=2)
+    euro = Option(strike=100, maturity_date=mat, option_type=QLOption.Call)
+    amer = Option(strike=100, maturity_date=mat, option_type=QLOption.Put, style="American")
+
+    p0 = bs.price(euro)
+    assert bs._option(Option(strike=100, maturity_date=mat, option_type=QLOption.Call)) is bs._option(euro)
+    f0 = fd.price(amer)
+
+    mkt.set_spot(105)
+    mkt.set_vol(0.25)
+    mkt.set_rate(0.04)
+    fresh_bs = BlackScholesModel(market=mkt, cache_size=0)
+    fresh_fd = FiniteDifferenceModel(mkt, cache_size=0)
+    assert bs.price(euro) == fresh_bs.price(euro) != p0
+    assert bs.price(amer) == fresh_bs.price(amer)
+    assert fd.price(amer) == fresh_fd.price(amer) != f0
+    assert bs.greeks(euro) == fresh_bs.greeks(euro)
+
+    for k in (90, 95, 110):
+        bs.price(Option(strike=k, maturity_date=mat, option_type=QLOption.Call))
+    assert len(bs._options) == 2 and len(fresh_bs._options) == 0
@@ -0,0 +1,44 @@
+import pickle
+from functools import partial
+import numpy as np
+import pytest
+from QuantLib import Settings, Date, Period, Months, Option as QLOption
+from ql_wrapper.context import ValuationContext
+from ql_wrapper.market import MarketParams
+from ql_wrapper.instruments import Option, AsianOption, Portfolio
+from ql_wrapper.models import FiniteDifferenceModel, BlackScholesModel
+
+def test_market_and_instrument_round_trip_through_pickle():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(101.0, 0.03, 0.01, context=ValuationContext(today + 5))
+    chain = [(today + Period(m, Months), k, 0.2 + 0.001 * (100 - k) + 0.01 * m) for m in (3, 6, 12) for k in (80.0, 100.0, 120.0)]
+    mkt.set_vol_chain(chain)
+    clone = pickle.loads(pickle.dumps(mkt))
+    assert (clone.spot, clone.r, clone.q, clone.today) == (101.0, 0.03, 0.01, today + 5)
+    assert abs(clone.vol_handle.blackVol(today + Period(9, Months), 95.0) -
+               mkt.vol_handle.blackVol(today + Period(9, Months), 95.0)) < 1e-14
+
+    opt = Option(95.0, today + Period(6, Months), QLOption.Put, style="American", desk="x")
+    opt.set_model(BlackScholesModel(market=mkt))
+    copy = pickle.loads(pickle.dumps(opt))
+    assert copy.key == opt.key and copy.meta == {"desk": "x"} and copy.model is None
+    fixings = [today + Period(m, Months) for m in (1, 2, 3)]
+    asian = pickle.loads(pickle.dumps(AsianOption(100.0, fixings[-1], QLOption.Call, fixings)))
+    assert asian.fixing_dates == fixings
+
+    mkt.set_vol_surface(mkt.vol_handle.currentLink())
+    with pytest.raises(ValueError):
+        mkt.snapshot()
+
+def test_price_parallel_matches_serial():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(100.0, 0.04, 0.01, vol=0.25)
+    options = [Option(K, today + Period(m, Months), t, style=s)
+               for m in (2, 7) for K in (90.0, 100.0, 110.0)
+               for t in (QLOption.Call, QLOption.Put) for s in ("European", "American")]
+    book = Portfolio.from_options(options + options[:5])
+    factory = partial(FiniteDifferenceModel, time_steps=50, grid_points=50)
+    serial = book.price(factory(market=mkt))
+    np.testing.assert_allclose(book.price_parallel(mkt, factory, workers=2, chunk_size=5), serial, rtol=1e-12)
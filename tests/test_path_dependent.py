@@ -0,0 +1,92 @@
+import math
+import numpy as np
+import pytest
+from QuantLib import Settings, Date, Period, Months, Weeks, Actual365Fixed, Option as QLOption
+from ql_wrapper.models import MonteCarloModel
+from ql_wrapper.instruments import AsianOption, BarrierOption, LookbackOption, Option, PathDependentOption
+from ql_wrapper.paths import GBMPathGenerator
+
+S0, r, q, vol = 100.0, 0.03, 0.01, 0.20
+
+def _geometric_asian_call(fixing_times, K, T):
+    # discrete geometric average is lognormal
+    t = np.asarray(fixing_times)
+    m = len(t)
+    mu = math.log(S0) + (r - q - 0.5 * vol * vol) * t.mean()
+    var = vol * vol * np.minimum.outer(t, t).sum() / (m * m)
+    d2 = (mu - math.log(K)) / math.sqrt(var)
+    d1 = d2 + math.sqrt(var)
+    N = lambda x: 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+    return math.exp(-r * T) * (math.exp(mu + 0.5 * var) * N(d1) - K * N(d2))
+
+def test_streamed_steps_match_path_array():
+    gen = GBMPathGenerator(S0, r, vol, q)
+    times = np.linspace(0.1, 1.0, 10)
+    paths = gen.paths(times, 1_001, seed=2, antithetic=True)
+    assert paths.shape == (10, 1_001)
+    for row, S in zip(paths, gen.iter_steps(times, 1_001, seed=2, antithetic=True)):
+        assert np.array_equal(row, S)
+
+def test_path_dependent_payoffs():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mat = today + Period(6, Months)
+    fixings = [today + Period(2 * i, Weeks) for i in range(1, 13)] + [mat]
+    dc = Actual365Fixed()
+    T = dc.yearFraction(today, mat)
+    mc = MonteCarloModel(spot=S0, risk_free_rate=r, volatility=vol, div_yield=q)
+
+    geo = AsianOption(100, mat, QLOption.Call, fixings, average="geometric")
+    expected = _geometric_asian_call([dc.yearFraction(today, d) for d in fixings], 100.0, T)
+    p, se = mc.price_and_se(geo, num_paths=100_000, seed=1, antithetic=True)
+    assert abs(p - expected) <= 4 * se
+    p_qmc, se_qmc = mc.price_and_se(geo, num_paths=16 * 4096, seed=1, sampler="sobol")
+    assert abs(p_qmc - expected) <= 4 * se_qmc + 1e-3 and se_qmc < se
+
+    arith = AsianOption(100, mat, QLOption.Call, fixings)
+    p_a, se_a = mc.price_and_se(arith, num_paths=50_000, seed=1)
+    p_cv, se_cv = mc.price_and_se(arith, num_paths=50_000, seed=1, control_variate="bs")
+    assert p_a > expected and se_cv < 0.6 * se_a and abs(p_cv - p_a) <= 4 * se_a
+
+    # knock-in + knock-out = vanilla, path by path
+    p_in, _ = mc.price_and_se(BarrierOption(100, mat, QLOption.Put, 90, "down-and-in", fixings), num_paths=20_000, seed=4)
+    p_out, _ = mc.price_and_se(BarrierOption(100, mat, QLOption.Put, 90, "down-and-out", fixings), num_paths=20_000, seed=4)
+    p_van, _ = mc.price_and_se(BarrierOption(100, mat, QLOption.Put, 1e-9, "down-and-out", fixings), num_paths=20_000, seed=4)
+    assert math.isclose(p_in + p_out, p_van, rel_tol=1e-12)
+
+    p_lb, _ = mc.price_and_se(LookbackOption(mat, QLOption.Call, fixings), num_paths=20_000, seed=4)
+    assert p_lb > mc.price(Option(100, mat, QLOption.Call), num_paths=20_000, seed=4)
+
+def test_path_dependent_base_is_abstract_and_lookback_strike_is_optional():
+    mat = Date.todaysDate() + Period(3, Months)
+    try:
+        PathDependentOption(100.0, mat, QLOption.Call, [mat])
+        assert False, "PathDependentOption must be abstract"
+    except TypeError:
+        pass
+    assert LookbackOption(mat, QLOption.Call, [mat]).strike is None
+    assert LookbackOption(mat, QLOption.Call, [mat], strike=95).strike == 95.0
+
+def test_vanilla_estimators_reject_path_dependent_options():
+    mat = Date.todaysDate() + Period(3, Months)
+    mc = MonteCarloModel(spot=S0, risk_free_rate=r, volatility=vol, div_yield=q)
+    for inst in (AsianOption(100, mat, QLOption.Call, [mat]), LookbackOption(mat, QLOption.Call, [mat])):
+        with pytest.raises(ValueError, match="path-dependent"):
+            mc.greeks(inst, num_paths=1000, seed=1)
+        with pytest.raises(ValueError, match="path-dependent"):
+            mc.price_batch([Option(100, mat, QLOption.Call), inst], num_paths=1000, seed=1)
+
+def test_keys_distinguish_path_dependent_terms():
+    mat = Date.todaysDate() + Period(3, Months)
+    early = mat - Period(1, Months)
+    options = [Option(100, mat, QLOption.Call),
+               AsianOption(100, mat, QLOption.Call, [mat]),
+               AsianOption(100, mat, QLOption.Call, [early, mat]),
+               AsianOption(100, mat, QLOption.Call, [mat], average="geometric"),
+               BarrierOption(100, mat, QLOption.Call, 120, "up-and-out", [mat]),
+               BarrierOption(100, mat, QLOption.Call, 120, "up-and-in", [mat]),
+               BarrierOption(100, mat, QLOption.Call, 110, "up-and-out", [mat]),
+               BarrierOption(100, mat, QLOption.Call, 120, "up-and-out", [mat], rebate=1.0),
+               LookbackOption(mat, QLOption.Call, [mat], strike=100)]
+    assert len({o.key for o in options}) == len(options)
+    assert AsianOption(100, mat, QLOption.Call, [mat]).key == options[1].key
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from QuantLib import Settings, Date, Period, Months, Option as QLOption
+from ql_wrapper.market import MarketParams
+from ql_wrapper.instruments import Option, Portfolio
+from ql_wrapper.models import BlackScholesModel, FiniteDifferenceModel, MonteCarloModel
+
+def _options(today):
+    return [Option(K, today + Period(m, Months), t, style=s)
+            for m in (1, 6, 12) for K in (90.0, 100.0, 110.0)
+            for t in (QLOption.Call, QLOption.Put) for s in ("European", "American")]
+
+def test_portfolio_matches_per_option_pricing():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(spot=100, risk_free_rate=0.04, div_yield=0.01, vol=0.22)
+    model = BlackScholesModel(market=mkt)
+    options = _options(today)
+    options = options + options[::3]  # repeated contracts
+    qty = np.linspace(-5, 5, len(options))
+    book = Portfolio.from_options(options, qty)
+    assert len(book) == len(options)
+
+    expected = np.array([model.price(o) for o in options])
+    np.testing.assert_allclose(book.price(model), expected, rtol=1e-10, atol=1e-12)
+    assert abs(book.value(model) - qty @ expected) < 1e-9
+
+    greeks = book.greeks(model)
+    for g in ("delta", "gamma", "vega", "theta"):
+        np.testing.assert_allclose(greeks[g], [model.greeks(o)[g] for o in options], rtol=1e-8, atol=1e-10, err_msg=g)
+    assert abs(book.total_greeks(model)["delta"] - qty @ greeks["delta"]) < 1e-12
+
+def test_fallback_dispatch_for_other_models():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(spot=100, risk_free_rate=0.04, vol=0.22)
+    options = _options(today)[:8]
+    book = Portfolio.from_options(options)
+    fd = FiniteDifferenceModel(mkt)
+    np.testing.assert_allclose(book.price(fd), [fd.price(o) for o in options], rtol=1e-12)
+
+    europeans = [o for o in options if o.style == "European"]
+    mc = MonteCarloModel(100, 0.04, 0.22)
+    prices = Portfolio.from_options(europeans).price(mc, num_paths=20000, seed=3)
+    np.testing.assert_allclose(prices, [p for p, _ in mc.price_batch(europeans, num_paths=20000, seed=3)])
+
+def test_column_construction_and_validation():
+    today = Date.todaysDate()
+    mat = (today + Period(3, Months)).serialNumber()
+    book = Portfolio([95.0, 105.0], mat, ["C", "put"], quantities=2.0)
+    assert list(book.option_type) == [QLOption.Call, QLOption.Put]
+    assert list(book.maturity) == [mat, mat] and list(book.quantity) == [2.0, 2.0]
+    assert book.option(1).strike == 105.0 and book.option(1).maturity == Date(mat)
+    with pytest.raises(ValueError):
+        Portfolio([100.0], mat, "C", styles="Bermudan")
+
+def test_american_groups_are_priced_and_risked_as_american():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(spot=100, risk_free_rate=0.05, vol=0.25)
+    options = [Option(K, today + Period(6, Months), QLOption.Put, style="American") for K in (90.0, 100.0, 110.0)]
+    book = Portfolio.from_options(options)
+    fd = FiniteDifferenceModel(mkt, 400, 400)
+    ref = {g: np.array([fd.greeks(o)[g] for o in options]) for g in ("delta", "gamma")}
+
+    bs = BlackScholesModel(market=mkt)
+    greeks = book.greeks(bs)
+    np.testing.assert_allclose(greeks["delta"], ref["delta"], atol=1e-2)
+    np.testing.assert_allclose(greeks["gamma"], ref["gamma"], atol=1e-3)
+    european = Portfolio.from_options([Option(o.strike, o.maturity, o.option_type) for o in options]).greeks(bs)
+    assert abs(greeks["delta"][-1] - european["delta"][-1]) > 0.02  # early exercise shows in the delta
+
+    mc = MonteCarloModel(100, 0.05, 0.25)
+    np.testing.assert_allclose(book.price(mc, num_paths=20_000, seed=7),
+                               [p for p, _ in mc.price_american(options, 20_000, seed=7)])
+    mc_greeks = book.greeks(mc, num_paths=20_000, seed=7, antithetic=True)
+    np.testing.assert_allclose(mc_greeks["delta"], ref["delta"], atol=2e-2)
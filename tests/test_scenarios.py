@@ -0,0 +1,83 @@
+import numpy as np
+from QuantLib import Settings, Date, Period, Months, Actual360, Option as QLOption
+from ql_wrapper.context import ValuationContext
+from ql_wrapper.market import MarketParams
+from ql_wrapper.instruments import Option
+from ql_wrapper.models import BlackScholesModel, FiniteDifferenceModel
+from ql_wrapper.analytic import bs_price
+from ql_wrapper.scenarios import scenario_pnl
+
+def _book(today, style):
+    return [Option(K, today + Period(m, Months), t, style=style)
+            for m in (3, 9) for K in (90.0, 100.0, 110.0) for t in (QLOption.Call, QLOption.Put)]
+
+def test_european_cube_matches_repricing_loop():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    book = _book(today, "European")
+    qty = np.arange(1, len(book) + 1, dtype=float)
+    spot_shocks, vol_shocks, rate_shocks = (-0.1, 0.0, 0.05), (-0.02, 0.03), (0.0, 50.0)
+    mkt = MarketParams(spot=100, risk_free_rate=0.03, div_yield=0.01, vol=0.2)
+    cube = scenario_pnl(book, mkt, spot_shocks, vol_shocks, rate_shocks, quantities=qty)
+    assert cube.shape == (3, 2, 2, 1)
+
+    model = BlackScholesModel(market=mkt)
+    base = qty @ [model.price(o) for o in book]
+    for i, ds in enumerate(spot_shocks):
+        for j, dv in enumerate(vol_shocks):
+            for k, dr in enumerate(rate_shocks):
+                mkt.set_spot(100 * (1 + ds)); mkt.set_vol(0.2 + dv); mkt.set_rate(0.03 + dr * 1e-4)
+                assert abs(cube[i, j, k, 0] - (qty @ [model.price(o) for o in book] - base)) < 1e-9
+
+def test_day_roll_and_by_instrument():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    book = _book(today, "European")
+    mkt = MarketParams(spot=100, risk_free_rate=0.03, vol=0.2)
+    per = scenario_pnl(book, mkt, day_rolls=(0, 30), by_instrument=True)
+    assert per.shape == (len(book), 1, 1, 1, 2)
+    assert np.all(per[..., 0] == 0.0)
+    opt = book[0]
+    T = (opt.maturity - today) / 365.0
+    expected = bs_price(100, opt.strike, T - 30 / 365.0, opt.option_type, 0.03, 0.0, 0.2) - \
+        bs_price(100, opt.strike, T, opt.option_type, 0.03, 0.0, 0.2)
+    assert abs(per[0, 0, 0, 0, 1] - expected) < 1e-12
+    np.testing.assert_allclose(per.sum(axis=0), scenario_pnl(book, mkt, day_rolls=(0, 30)))
+
+def test_american_ladder_close_to_fd_repricing():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    book = _book(today, "American")
+    mkt = MarketParams(spot=100, risk_free_rate=0.05, div_yield=0.02, vol=0.25)
+    spot_shocks, vol_shocks = np.linspace(-0.2, 0.2, 5), (-0.05, 0.05)
+    per = scenario_pnl(book, mkt, spot_shocks, vol_shocks, by_instrument=True, time_steps=200, grid_points=200)
+
+    model = FiniteDifferenceModel(mkt, time_steps=200, grid_points=200)
+    base = np.array([model.price(o) for o in book])
+    for j, dv in enumerate(vol_shocks):
+        for i, ds in enumerate(spot_shocks):
+            mkt.set_spot(100 * (1 + ds)); mkt.set_vol(0.25 + dv)
+            expected = np.array([model.price(o) for o in book]) - base
+            np.testing.assert_allclose(per[:, i, j, 0, 0], expected, atol=5e-3)
+
+def test_context_day_count_drives_maturities_and_rolls():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    ctx = ValuationContext(today, Actual360())
+    mkt = MarketParams(spot=100, risk_free_rate=0.03, div_yield=0.01, vol=0.2, context=ctx)
+    book = _book(today, "European")
+    per = scenario_pnl(book, mkt, spot_shocks=(0.05,), day_rolls=(0, 30), by_instrument=True)
+    model = BlackScholesModel(market=mkt)
+    base = np.array([model.price(o) for o in book])
+    mkt.set_spot(105.0)
+    np.testing.assert_allclose(per[:, 0, 0, 0, 0], [model.price(o) for o in book] - base, atol=1e-9)
+    mkt.set_date(today + 30)
+    np.testing.assert_allclose(per[:, 0, 0, 0, 1], [model.price(o) for o in book] - base, atol=1e-9)
+
+    put = Option(100.0, today + Period(9, Months), QLOption.Put, style="American")
+    fd_mkt = MarketParams(spot=100, risk_free_rate=0.03, div_yield=0.01, vol=0.2, context=ctx)
+    pnl = scenario_pnl([put], fd_mkt, spot_shocks=(0.05,), time_steps=200, grid_points=200)
+    fd = FiniteDifferenceModel(fd_mkt, time_steps=200, grid_points=200)
+    p0 = fd.price(put)
+    fd_mkt.set_spot(105.0)
+    assert abs(pnl[0, 0, 0, 0] - (fd.price(put) - p0)) < 2e-3
@@ -0,0 +1,105 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from QuantLib import Settings, Date, Period, Months, Option as QLOption, Observer
+from ql_wrapper.context import ValuationContext, keep_evaluation_date
+from ql_wrapper.market import MarketParams
+from ql_wrapper.instruments import Option
+from ql_wrapper.models import BlackScholesModel, FiniteDifferenceModel, MonteCarloModel
+
+def test_models_follow_their_market_context_not_global_settings():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    opt = Option(100.0, today + 380, QLOption.Put, style="American")
+    later = MarketParams(100, 0.03, vol=0.2, context=ValuationContext(today + 180))
+    bs, fd = BlackScholesModel(market=later), FiniteDifferenceModel(later)
+    assert Settings.instance().evaluationDate == today
+    assert bs.today == fd.today == later.today == today + 180
+
+    now = MarketParams(100, 0.03, vol=0.2)
+    same_tenor = Option(100.0, today + 200, QLOption.Put, style="American")
+    with keep_evaluation_date():
+        assert abs(bs.price(opt) - BlackScholesModel(market=now).price(same_tenor)) < 1e-10
+        assert abs(fd.price(opt) - FiniteDifferenceModel(now).price(same_tenor)) < 1e-10
+    assert Settings.instance().evaluationDate == today
+
+def test_date_roll_moves_market_and_models_together():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    mkt = MarketParams(100, 0.03, vol=0.2)
+    bs = BlackScholesModel(market=mkt)
+    opt = Option(100.0, today + Period(6, Months), QLOption.Call)
+    p0 = bs.price(opt)
+    mkt.set_date(today + Period(3, Months))
+    assert bs.today == today + Period(3, Months)
+    fresh = MarketParams(100, 0.03, vol=0.2, context=ValuationContext(today + Period(3, Months)))
+    assert abs(bs.price(opt) - BlackScholesModel(market=fresh).price(opt)) < 1e-12
+    assert bs.price(opt) < p0
+
+def test_thread_pool_books_on_different_dates():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    opts = [Option(K, today + Period(9, Months), t, style="American")
+            for K in (90.0, 100.0, 110.0) for t in (QLOption.Call, QLOption.Put)]
+    models = [BlackScholesModel(market=MarketParams(100, 0.03, vol=0.2, context=ValuationContext(today + d)))
+              for d in (0, 30, 60, 90)]
+    expected = [[m.price(o) for o in opts] for m in models]
+    for m in models:
+        m._options.clear()
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda m: [m.price(o) for _ in range(20) for o in opts][-len(opts):], models))
+    assert results == expected
+    Settings.instance().evaluationDate = today
+
+def test_reprice_off_the_global_date_is_cached_inside_a_batch():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    fd = FiniteDifferenceModel(MarketParams(100, 0.03, vol=0.2))
+    opt = Option(100.0, today + 180, QLOption.Put, style="American")
+    first = fd.price(opt)
+    notified = []
+    observer = Observer(lambda: notified.append(1))
+    observer.registerWith(fd._option(opt))
+    Settings.instance().evaluationDate = today + 1
+    with keep_evaluation_date():
+        assert fd.price(opt) == first  # switches to the market's date once
+        notified.clear()
+        assert fd.price(opt) == first
+        assert not notified
+    assert Settings.instance().evaluationDate == today + 1
+    Settings.instance().evaluationDate = today
+
+def test_pinned_pricing_does_not_leak_its_date():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    call = Option(100.0, today + 180, QLOption.Call)
+    mc = MonteCarloModel(100, 0.03, 0.2)
+    before = mc.price(call, 20000, seed=7)
+    later = BlackScholesModel(market=MarketParams(100, 0.03, vol=0.2, context=ValuationContext(today + 90)))
+    later.price(call)
+    assert Settings.instance().evaluationDate == today
+    assert mc.price(call, 20000, seed=7) == before
+    assert MarketParams(100, 0.03, vol=0.2).today == today
+
+def test_default_contexts_are_pinned_at_construction():
+    today = Date.todaysDate()
+    Settings.instance().evaluationDate = today
+    bs, mc = BlackScholesModel(100, 0.03, 0.2), MonteCarloModel(100, 0.03, 0.2)
+    Settings.instance().evaluationDate = today + 5
+    try:
+        assert bs.today == mc.context.date == today
+    finally:
+        Settings.instance().evaluationDate = today
+
+def test_market_copies_an_unpinned_context():
+    ctx = ValuationContext()
+    mkt = MarketParams(100, 0.03, vol=0.2, context=ctx)
+    assert not ctx.pinned and mkt.context.pinned and mkt.context is not ctx
+
+def test_context_pickles_and_mc_uses_it():
+    today = Date.todaysDate()
+    ctx = ValuationContext(today + 10)
+    clone = pickle.loads(pickle.dumps(ctx))
+    assert clone.date == ctx.date and clone.day_count.name() == ctx.day_count.name()
+    mat = today + Period(6, Months)
+    mc = MonteCarloModel(100, 0.03, 0.2, context=ctx)
+    assert abs(mc._year_fraction(Option(100.0, mat, QLOption.Call)) - (mat - today - 10) / 365.0) < 1e-15
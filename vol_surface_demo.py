@@ -2,25 +2,16 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from scipy.stats import norm
-from scipy.optimize import newton
 import matplotlib.pyplot as plt
 import seaborn as sns
 from QuantLib import Date, Actual365Fixed
+from ql_wrapper.analytic import implied_vol
 
 # --- Parameters ---
 TICKER = "AAPL"
 r = 0.01  # flat risk-free rate
 day_count = Actual365Fixed()
 
-# --- Black–Scholes call price ---
-def bs_call_price(S, K, r, T, sigma):
-    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
-        return np.nan
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-    return S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
-
 # --- Fetch market data ---
 ticker = yf.Ticker(TICKER)
 S0 = float(ticker.history(period="1d")["Close"].iloc[-1])
@@ -43,18 +34,8 @@ for expiry_str in ticker.options:
     calls = calls.copy()
     calls["mid"] = (calls["bid"].fillna(0) + calls["ask"].fillna(0)) / 2
 
-    # Row-wise implied vol solver
-    def _imp_vol_call(row):
-        K = float(row["strike"])  # ensure float
-        market_price = float(row["mid"]) if pd.notna(row["mid"]) else np.nan
-        if not np.isfinite(market_price) or market_price <= 0:
-            return np.nan
-        try:
-            return newton(lambda vol: bs_call_price(S0, K, r, T, vol) - market_price, 0.2, maxiter=50)
-        except Exception:
-            return np.nan
-
-    calls["imp_vol"] = calls.apply(_imp_vol_call, axis=1)
+    # Vectorized implied vol solve over the whole expiry (arbitrage-violating quotes come back NaN)
+    calls["imp_vol"] = implied_vol(calls["mid"].to_numpy(), S0, calls["strike"].to_numpy(), T, "C", r)
     valid = calls.loc[calls["imp_vol"].astype(float) > 0, ["strike", "imp_vol"]]
     for _, rr in valid.iterrows():
         imp_vol_rows.append({